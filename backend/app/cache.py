@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+
+class PersistentLRUCache:
+    """
+    String key/value cache: an in-memory LRU in front of a SQLite file.
+
+    The SQLite file survives restarts and is shared by every process that
+    points at it (uvicorn workers, pool workers); the LRU keeps hot entries
+    off disk. ``path=None`` gives a memory-only cache. With ``ttl`` (seconds)
+    entries expire in both tiers.
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int = 1024,
+                 max_disk_entries: int = 100_000, table: str = "cache",
+                 ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.table = table
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+        if path:
+            try:
+                self._conn = self._connect(path)
+            except sqlite3.Error as e:
+                logger.warning("cache_disk_unavailable", path=path, error=str(e))
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed_at REAL NOT NULL, "
+            "expires_at REAL)"
+        )
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+        if "expires_at" not in columns:
+            conn.execute(f"ALTER TABLE {self.table} ADD COLUMN expires_at REAL")
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            now = time.time()
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            entry = self._disk_get(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._remember(key, *entry)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            expires_at = time.time() + self.ttl if self.ttl else None
+            self._remember(key, value, expires_at)
+            self._disk_set(key, value, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "persistent": self._conn is not None,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, value: str, expires_at: Optional[float]):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, Optional[float]]]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.warning("cache_read_failed", error=str(e))
+            return None
+
+    def _disk_set(self, key: str, value: str, expires_at: Optional[float]):
+        if self._conn is None:
+            return
+        try:
+            now = time.time()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, accessed_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, expires_at)
+            )
+            self._writes += 1
+            # Trim the file every so often rather than on every write
+            if self._writes % 100 == 0:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,)
+                )
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning("cache_write_failed", error=str(e))
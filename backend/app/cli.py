@@ -0,0 +1,142 @@
+"""
+Command-line parser for a single statement:
+
+    python main.py [--profile] <pdf_path>
+
+Kept apart from the API module so CLI runs don't import the web stack.
+"""
+
+import sys
+
+from app.issuer_detector import IssuerDetector
+from app.metrics import StageTimer
+from app.pdf_loader import PDFLoader, text_engine_for
+from app.parser_registry import get_parser_registry
+from app.pipeline import get_parser
+from app.profiler import CPROFILE, RequestProfiler
+
+
+def main(argv=None) -> int:
+    # --profile: write a cProfile dump of the run to PROFILE_DIR
+    argv = sys.argv[1:] if argv is None else argv
+    profile = "--profile" in argv
+    args = [arg for arg in argv if arg != "--profile"]
+
+    if not args:
+        print("Usage: python main.py [--profile] <pdf_path>")
+        print("\nSupported Issuers:")
+        for info in get_parser_registry().infos():
+            print(f"  • {info.name}")
+        return 1
+
+    pdf_path = args[0]
+    timer = StageTimer()
+    request_profiler = RequestProfiler(CPROFILE if profile else None)
+
+    print(f"\n{'='*60}")
+    print(f"CREDIT CARD STATEMENT PARSER v2.0")
+    print(f"{'='*60}\n")
+
+    with request_profiler:
+        # Load PDF
+        print("📄 Loading PDF...")
+        with timer.span("pdf_open"):
+            document = PDFLoader.load(pdf_path)
+        with document:
+            issuer = _parse_document(document, timer)
+            page_count = document.page_count
+
+    if profile:
+        path = request_profiler.finish(issuer, page_count, timer.timings)
+        print(f"📈 Profile written to {path}")
+        print(f"   Inspect with: python -m pstats {path}")
+    return 0
+
+
+def _parse_document(document, timer: StageTimer):
+    """Detect, parse and print one loaded statement; returns the issuer"""
+    with timer.span("text_extraction"):
+        text = document.text
+    print(f"   ✓ Extracted {len(text)} characters")
+    print(f"   ✓ Found {document.page_count} pages\n")
+
+    # Detect issuer
+    print("🔍 Detecting issuer...")
+    with timer.span("issuer_detection"):
+        issuer, confidence = IssuerDetector.detect(text)
+    if issuer and document.set_text_engine(text_engine_for(issuer)):
+        with timer.span("text_extraction"):
+            text = document.text
+    print(f"   ✓ Detected: {issuer} (confidence: {confidence:.2f})\n")
+
+    # Parse
+    parser = get_parser(issuer) if issuer else None
+    if not parser:
+        print(f"❌ No parser available for {issuer}")
+        print(f"   Supported issuers: {', '.join(get_parser_registry().codes())}")
+        return issuer
+
+    print("⚙️  Parsing statement...")
+    with timer.span("parse"):
+        result = parser.parse(text, document.table_provider())
+    _print_result(result)
+    return issuer
+
+
+def _print_result(result):
+    print(f"\n{'='*60}")
+    print(f"PARSING RESULTS")
+    print(f"{'='*60}")
+    print(f"Overall Confidence: {result.overall_confidence:.2f}")
+    print(f"Fallback Used: {'Yes (LLM)' if result.fallback_used else 'No (Regex)'}")
+    print(f"\n{'-'*60}")
+
+    # Format output with colors/emojis
+    fields = [
+        ("🏦 Issuer", result.issuer),
+        ("💳 Card Last 4", result.card_last_4),
+        ("📅 Statement Period", result.statement_period),
+        ("⏰ Due Date", result.due_date),
+        ("💰 Total Due", result.total_amount_due)
+    ]
+
+    for label, field in fields:
+        method_emoji = {
+            "regex": "🔧",
+            "table": "📊", 
+            "layout": "📐",
+            "llm": "🤖"
+        }.get(field.extraction_method, "❓")
+
+        conf_color = "🟢" if field.confidence >= 0.9 else "🟡" if field.confidence >= 0.7 else "🔴"
+
+        value_display = field.value if field.value else "NOT FOUND"
+        if label == "💰 Total Due" and field.value:
+            value_display = f"₹{field.value}"
+
+        print(f"\n{label}")
+        print(f"  Value: {value_display}")
+        print(f"  Method: {method_emoji} {field.extraction_method.upper()}")
+        print(f"  Confidence: {conf_color} {field.confidence:.2f}")
+
+    if result.parsing_errors:
+        print(f"\n{'-'*60}")
+        print("⚠️  WARNINGS:")
+        for error in result.parsing_errors:
+            print(f"  • {error}")
+
+    print(f"\n{'='*60}")
+
+    # Summary
+    if result.overall_confidence >= 0.9:
+        print("✅ HIGH CONFIDENCE - All fields extracted reliably")
+    elif result.overall_confidence >= 0.7:
+        print("⚠️  MEDIUM CONFIDENCE - Some fields may need verification")
+    else:
+        print("❌ LOW CONFIDENCE - Manual review recommended")
+
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
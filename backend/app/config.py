@@ -1,19 +1,112 @@
 # app/config.py
 import os
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """"HDFC=a,ICICI=b" -> {"HDFC": "a", "ICICI": "b"}"""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {key.strip(): val.strip() for key, val in pairs}
+
+
 class Config:
     # Groq Configuration
     GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY")
     DEFAULT_MODEL: str = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
+    # Another Groq-compatible endpoint, e.g. the benchmarks.fake_groq stand-in
+    GROQ_BASE_URL: Optional[str] = os.getenv("GROQ_BASE_URL") or None
 
-    # Parser Configuration
+    # Parser Configuration. Fields scoring below the confidence threshold
+    # (missing ones score 0) are sent to the LLM fallback; per-issuer
+    # overrides e.g. "AMEX=0.8,SBI=0" (0 = never call the LLM)
     CONFIDENCE_THRESHOLD: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
+    CONFIDENCE_THRESHOLD_BY_ISSUER: Dict[str, float] = {
+        issuer: float(threshold)
+        for issuer, threshold in _parse_mapping(os.getenv("CONFIDENCE_THRESHOLD_BY_ISSUER", "")).items()
+    }
     USE_LLM_FALLBACK: bool = os.getenv("USE_LLM_FALLBACK", "true").lower() in ("true", "1", "yes")
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
 
+    # Max LLM fallback calls per API request (a batch upload shares it; 0 = no cap)
+    LLM_REQUEST_BUDGET: int = int(os.getenv("LLM_REQUEST_BUDGET", "0"))
+
+    # LLM call limits (timeout and backoff in seconds)
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "20"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    LLM_BACKOFF_BASE: float = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+    LLM_BACKOFF_MAX: float = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+    LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+    # Cross-document batching of async LLM fallback calls: a request waits up
+    # to LLM_BATCH_WINDOW_MS for others, a batch holds up to LLM_BATCH_MAX_DOCS
+    LLM_BATCH_ENABLED: bool = os.getenv("LLM_BATCH_ENABLED", "false").lower() in ("true", "1", "yes")
+    LLM_BATCH_WINDOW_MS: float = float(os.getenv("LLM_BATCH_WINDOW_MS", "50"))
+    LLM_BATCH_MAX_DOCS: int = int(os.getenv("LLM_BATCH_MAX_DOCS", "8"))
+
+    # LLM prompt context: header lines, lines around each label, size cap
+    LLM_CONTEXT_HEADER_LINES: int = int(os.getenv("LLM_CONTEXT_HEADER_LINES", "8"))
+    LLM_CONTEXT_WINDOW: int = int(os.getenv("LLM_CONTEXT_WINDOW", "1"))
+    LLM_CONTEXT_MAX_CHARS: int = int(os.getenv("LLM_CONTEXT_MAX_CHARS", "4000"))
+
+    # LLM response cache (keyed by model + prompt; TTL in seconds, 0 = never expire)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "cache/llm.sqlite3")
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "512"))
+    LLM_CACHE_DISK_SIZE: int = int(os.getenv("LLM_CACHE_DISK_SIZE", "50000"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+    # Extra parsers on top of the built-in ones and installed entry points,
+    # e.g. "KOTAK=kotak_parser:KotakParser"
+    PARSER_PLUGINS: Dict[str, str] = _parse_mapping(os.getenv("PARSER_PLUGINS", ""))
+
+    # Pattern specs (app/patterns/*.yaml); re-checked every N seconds, 0 = never
+    PATTERN_DIR: str = os.getenv("PATTERN_DIR", os.path.join(os.path.dirname(__file__), "patterns"))
+    PATTERN_RELOAD_INTERVAL: float = float(os.getenv("PATTERN_RELOAD_INTERVAL", "2"))
+
+    # Page streaming: stop reading pages once the issuer and every field are
+    # found; the budget caps pages read while fields are missing (0 = no cap)
+    STREAMING_EXTRACTION: bool = os.getenv("STREAMING_EXTRACTION", "true").lower() in ("true", "1", "yes")
+    STREAM_PAGE_BUDGET: int = int(os.getenv("STREAM_PAGE_BUDGET", "0"))
+
+    # PDF text engine: "pymupdf" (fast) or "pdfplumber" (rebuilds reading
+    # order from character positions); tables always use pdfplumber.
+    # Per-issuer overrides, e.g. "ICICI=pdfplumber,AMEX=pdfplumber"
+    PDF_TEXT_ENGINE: str = os.getenv("PDF_TEXT_ENGINE", "pymupdf")
+    PDF_TEXT_ENGINE_BY_ISSUER: Dict[str, str] = _parse_mapping(os.getenv("PDF_TEXT_ENGINE_BY_ISSUER", ""))
+
+    # Large statements: low-memory mode releases each page's parsed objects
+    # after use; a statement growing worker RSS by more than the ceiling
+    # fails instead of getting the worker OOM-killed (0 = no ceiling; only
+    # enforced in process pool workers, not with WORKER_PROCESSES=0)
+    LOW_MEMORY_MODE: bool = os.getenv("LOW_MEMORY_MODE", "false").lower() in ("true", "1", "yes")
+    MAX_REQUEST_MEMORY_MB: float = float(os.getenv("MAX_REQUEST_MEMORY_MB", "0"))
+
+    # Uploads (bytes); larger files are rejected with 413
+    MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+    # Files per /parse-statements request
+    MAX_BATCH_FILES: int = int(os.getenv("MAX_BATCH_FILES", "20"))
+
+    # Profiling: cProfile 1 in N requests and/or keep stack samples of
+    # requests slower than PROFILE_SLOW_MS (0 = off)
+    PROFILE_SAMPLE_RATE: int = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_SLOW_MS: float = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+
+    # Execution (0 worker processes runs the CPU stages in threads instead)
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 1)))
+    # Import PDF libraries and build every parser at startup (and in each
+    # worker as it spawns) instead of on first use
+    WARMUP_ON_START: bool = os.getenv("WARMUP_ON_START", "false").lower() in ("true", "1", "yes")
+
+    # Result cache (keyed by PDF hash + parser version; empty path = memory only)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+    RESULT_CACHE_PATH: str = os.getenv("RESULT_CACHE_PATH", "cache/results.sqlite3")
+    RESULT_CACHE_SIZE: int = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
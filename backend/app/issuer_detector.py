@@ -1,48 +1,142 @@
 import re
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import structlog
 
+from app.pattern_registry import get_pattern_registry
+
 logger = structlog.get_logger()
 
 class IssuerDetector:
-    """Multi-strategy issuer detection"""
-    
-    ISSUER_PATTERNS = {
-        "HDFC": [r"hdfc\s+bank", r"hdfc\s+credit\s+card"],
-        "ICICI": [r"icici\s+bank", r"icici\s+credit"],
-        "SBI": [r"sbi\s+card", r"state\s+bank.*card"],
-        "AXIS": [r"axis\s+bank", r"axis\s+credit"],
-        "AMEX": [r"american\s+express", r"amex"]
-    }
-    
+    """
+    Multi-strategy issuer detection
+
+    Each issuer's patterns come from the ``detect`` list of its pattern
+    spec, so plugin parsers are detected like the built-in ones.
+
+    The statement header (where the issuer is almost always named) is
+    checked first with all issuer patterns fused into a single regex. When
+    anything matches, each issuer's own patterns score the header, and if
+    one issuer clearly wins there the rest of the document is never read.
+    Otherwise the whole text is scored the same way. Scores always come
+    from separate per-pattern scans: matches of the fused alternation can't
+    overlap, so it would undercount issuers whose patterns do.
+    """
+
+    # Characters (rounded up to a line end) treated as the statement header
+    HEADER_CHARS = 4000
+    # Header verdict is final once the leader is this many matches ahead
+    # and already at full confidence
+    EARLY_EXIT_MARGIN = 2
+
+    _fused: Optional[re.Pattern] = None
+    _compiled: Optional[Dict[str, List[re.Pattern]]] = None
+    _key: Optional[tuple] = None
+
     @classmethod
-    def detect(cls, text: str) -> Tuple[Optional[str], float]:
+    def issuer_patterns(cls) -> Dict[str, List[str]]:
         """
-        Detect issuer with confidence score
-        Returns: (issuer_name, confidence)
+        Detection patterns (the ``detect`` list of each pattern spec) of
+        every issuer with a registered parser, built-in or plugin
+        """
+        from app.parser_registry import get_parser_registry
+
+        specs = get_pattern_registry().specs()
+        return {code: specs[code].detect for code in get_parser_registry().codes()
+                if code in specs and specs[code].detect}
+
+    @classmethod
+    def _matchers(cls) -> Tuple[re.Pattern, Dict[str, List[re.Pattern]]]:
+        """
+        Compiled once per process and again after a pattern spec reload.
+        The fused gate names its groups g0, g1, ... since plugin issuer
+        codes need not be valid group names
         """
-        text_lower = text.lower()
+        from app.parser_registry import get_parser_registry
+
+        registry = get_pattern_registry()
+        registry.specs()  # picks up changed spec files
+        key = (id(registry), registry.generation, id(get_parser_registry()))
+        if cls._key != key:
+            patterns = cls.issuer_patterns()
+            cls._compiled = {
+                issuer: [re.compile(p) for p in issuer_patterns]
+                for issuer, issuer_patterns in patterns.items()
+            }
+            # "(?!)" never matches: no issuer has detection patterns
+            cls._fused = re.compile("|".join(
+                f"(?P<g{index}>{'|'.join(issuer_patterns)})"
+                for index, issuer_patterns in enumerate(patterns.values())
+            ) or "(?!)")
+            cls._key = key
+        return cls._fused, cls._compiled
+
+    @classmethod
+    def _header(cls, text: str) -> str:
+        end = text.find("\n", cls.HEADER_CHARS)
+        return text if end == -1 else text[:end]
+
+    @staticmethod
+    def _score(text_lower: str, compiled: Dict[str, List[re.Pattern]]) -> Dict[str, int]:
+        """Matches of each issuer's patterns, for issuers with any"""
         scores = {}
-        
-        for issuer, patterns in cls.ISSUER_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text_lower))
-                score += matches
-            
+        for issuer, patterns in compiled.items():
+            score = sum(len(pattern.findall(text_lower)) for pattern in patterns)
             if score > 0:
                 scores[issuer] = score
-        
+        return scores
+
+    @classmethod
+    def _clear_winner(cls, scores: Dict[str, int],
+                      compiled: Dict[str, List[re.Pattern]]) -> bool:
+        if not scores:
+            return False
+        ranked = sorted(scores.values(), reverse=True)
+        leader = max(scores, key=scores.get)
+        runner_up = ranked[1] if len(ranked) > 1 else 0
+        return (ranked[0] >= len(compiled[leader])
+                and ranked[0] - runner_up >= cls.EARLY_EXIT_MARGIN)
+
+    @classmethod
+    def score(cls, text: str) -> Dict[str, int]:
+        """
+        Pattern matches per issuer in ``text``; scores of consecutive
+        chunks (e.g. pages) add up to the score of the whole
+        """
+        _, compiled = cls._matchers()
+        return cls._score(text.lower(), compiled)
+
+    @classmethod
+    def verdict(cls, scores: Dict[str, int]) -> Tuple[Optional[str], float]:
+        """Leading issuer and its confidence for ``score`` totals"""
         if not scores:
-            logger.warning("issuer_not_detected")
             return None, 0.0
-        
-        # Get issuer with highest score
+        _, compiled = cls._matchers()
         detected_issuer = max(scores, key=scores.get)
 
         # Calculate confidence normalized by the number of patterns defined for that issuer
-        max_possible = len(cls.ISSUER_PATTERNS.get(detected_issuer, [])) or 1
-        confidence = min(scores[detected_issuer] / float(max_possible), 1.0)
-        
+        max_possible = len(compiled.get(detected_issuer, [])) or 1
+        return detected_issuer, min(scores[detected_issuer] / float(max_possible), 1.0)
+
+    @classmethod
+    def detect(cls, text: str) -> Tuple[Optional[str], float]:
+        """
+        Detect issuer with confidence score
+        Returns: (issuer_name, confidence)
+        """
+        fused, compiled = cls._matchers()
+        scores = {}
+
+        header = cls._header(text).lower()
+        if fused.search(header):
+            scores = cls._score(header, compiled)
+
+        if len(header) < len(text) and not cls._clear_winner(scores, compiled):
+            scores = cls._score(text.lower(), compiled)
+
+        if not scores:
+            logger.warning("issuer_not_detected")
+            return None, 0.0
+
+        detected_issuer, confidence = cls.verdict(scores)
         logger.info("issuer_detected", issuer=detected_issuer, confidence=confidence)
-        return detected_issuer, confidence
\ No newline at end of file
+        return detected_issuer, confidence
@@ -0,0 +1,202 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Sequence, Set
+import structlog
+
+from app.config import Config
+from app.llm_extractor import (FIELD_DESCRIPTIONS, LLMExtractor, build_context,
+                               get_llm_extractor, get_response_cache, llm_stats)
+
+logger = structlog.get_logger()
+
+
+def _resolve(future: asyncio.Future, result=None, error: Optional[Exception] = None):
+    """Settle a caller's future unless the caller has gone (cancelled)"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class _Request:
+    """One document's fallback request waiting for its batch"""
+
+    def __init__(self, text: str, issuer: Optional[str], fields: List[str],
+                 future: asyncio.Future):
+        self.text = text
+        self.issuer = issuer
+        self.fields = fields
+        self.future = future
+
+
+def build_batch_prompt(requests: Sequence[_Request]) -> str:
+    """
+    One prompt covering every document in ``requests``; the answer is a
+    JSON object keyed by document id ("doc0", "doc1", ...), each holding
+    that document's requested fields.
+    """
+    schemas, excerpts = [], []
+    for index, request in enumerate(requests):
+        doc_id = f"doc{index}"
+        fields = ", ".join(f'"{field}": "{FIELD_DESCRIPTIONS[field]}"' for field in request.fields)
+        schemas.append(f'  "{doc_id}": {{{fields}}}')
+        hint = f" (issuer is likely {request.issuer})" if request.issuer else ""
+        excerpts.append(f"=== {doc_id}{hint} ===\n{build_context(request.text, request.fields)}")
+    schema = ",\n".join(schemas)
+    documents = "\n\n".join(excerpts)
+
+    return f"""
+Extract the following information from each of these credit card statement excerpts.
+Each document is separate: only use a document's own text for its fields.
+Return ONLY valid JSON with one object per document id. No explanation.
+
+{{
+{schema}
+}}
+
+Rules:
+- If missing, return null
+- Amount must be numeric only
+- Preserve original date format
+
+{documents}
+""".strip()
+
+
+class LLMBatcher:
+    """
+    Coalesces LLM fallback requests from concurrent statements into
+    multi-document prompts. A request waits at most LLM_BATCH_WINDOW_MS
+    for others to join; a batch is sent as soon as it holds
+    LLM_BATCH_MAX_DOCS documents. Each caller gets its own document's
+    fields back.
+
+    Batches go through the extractor's concurrency limit, retries and
+    stats. When a batch call fails (after its retries), or its answer lacks
+    a document, the affected documents are resubmitted as ordinary
+    single-document calls, so batching never loses a result the plain path
+    would have returned.
+    """
+
+    def __init__(self, extractor: Optional[LLMExtractor] = None,
+                 window_ms: float = None, max_docs: int = None):
+        self._extractor = extractor
+        self.window = (Config.LLM_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.max_docs = Config.LLM_BATCH_MAX_DOCS if max_docs is None else max_docs
+        # Pending requests and their flush timer, per event loop
+        self._pending: Dict[int, List[_Request]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        # In-flight batch tasks (the loop only keeps weak references)
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def extractor(self) -> LLMExtractor:
+        if self._extractor is None:
+            self._extractor = get_llm_extractor()
+        return self._extractor
+
+    async def extract_fields_async(self, text: str, issuer: Optional[str] = None,
+                                   fields: Optional[Sequence[str]] = None) -> Dict:
+        """Same contract as ``LLMExtractor.extract_fields_async``"""
+        extractor = self.extractor
+        fields = [field for field in (fields or FIELD_DESCRIPTIONS) if field in FIELD_DESCRIPTIONS]
+        if not extractor.async_client:
+            raise ValueError("Groq client not initialized")
+
+        # A cached single-document answer beats waiting for a batch
+        prompt = extractor._build_prompt(text, issuer, fields)
+        _, _, data = await asyncio.to_thread(
+            extractor._cache_lookup, Config.LLM_CACHE_ENABLED, Config.DEFAULT_MODEL, prompt
+        )
+        if data is not None:
+            return data
+
+        loop = asyncio.get_running_loop()
+        loop_id = id(loop)
+        request = _Request(text, issuer, fields, loop.create_future())
+        pending = self._pending.setdefault(loop_id, [])
+        pending.append(request)
+        if len(pending) >= self.max_docs:
+            self._flush(loop_id)
+        elif loop_id not in self._timers:
+            self._timers[loop_id] = loop.call_later(self.window, self._flush, loop_id)
+        return await request.future
+
+    def _flush(self, loop_id: int):
+        timer = self._timers.pop(loop_id, None)
+        if timer is not None:
+            timer.cancel()
+        requests = self._pending.pop(loop_id, [])
+        if requests:
+            task = asyncio.get_running_loop().create_task(self._send(requests))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, requests: List[_Request]):
+        if len(requests) == 1:
+            await self._send_single(requests[0])
+            return
+
+        model = Config.DEFAULT_MODEL
+        llm_stats.incr("batches")
+        llm_stats.incr("batched_documents", len(requests))
+        try:
+            _, data = await self.extractor.complete_async(model, build_batch_prompt(requests))
+        except Exception as e:
+            # Timed out or malformed even after the retries: every document
+            # falls back to its own call below
+            logger.warning("llm_batch_failed", documents=len(requests), error=str(e))
+            data = {}
+
+        retry, answered = [], []
+        for index, request in enumerate(requests):
+            answer = data.get(f"doc{index}") if isinstance(data, dict) else None
+            if not isinstance(answer, dict):
+                retry.append(request)
+                continue
+            answer = {field: answer.get(field) for field in request.fields}
+            answered.append((request, answer))
+            _resolve(request.future, answer)
+        if answered and Config.LLM_CACHE_ENABLED:
+            await asyncio.to_thread(self._cache_answers, model, answered)
+
+        if retry:
+            llm_stats.incr("batch_fallbacks", len(retry))
+            logger.info("llm_batch_fallback", documents=len(retry), batch=len(requests))
+            await asyncio.gather(*(self._send_single(request) for request in retry))
+
+    def _cache_answers(self, model: str, answered: List[tuple]):
+        """
+        Store each batched answer as its single-document answer, so a repeat
+        of the statement is a cache hit whether or not it gets batched
+        (blocking SQLite writes; run in a thread)
+        """
+        cache = get_response_cache()
+        if cache is None:
+            return
+        for request, answer in answered:
+            prompt = self.extractor._build_prompt(request.text, request.issuer, request.fields)
+            cache.set(LLMExtractor._cache_key(model, prompt), json.dumps({"raw": None, "data": answer}))
+
+    async def _send_single(self, request: _Request):
+        try:
+            data = await self.extractor.extract_fields_async(
+                request.text, issuer=request.issuer, fields=request.fields
+            )
+        except Exception as e:
+            _resolve(request.future, error=e)
+        else:
+            _resolve(request.future, data)
+
+
+_batcher: Optional[LLMBatcher] = None
+
+
+def get_llm_batcher() -> LLMBatcher:
+    """Process-wide batcher over the shared extractor"""
+    global _batcher
+    if _batcher is None:
+        _batcher = LLMBatcher()
+    return _batcher
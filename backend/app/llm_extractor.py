@@ -1,10 +1,181 @@
+import asyncio
+import hashlib
 import json
-from typing import Dict, Optional
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
 import structlog
+from app.cache import PersistentLRUCache
 from app.config import Config
 
 logger = structlog.get_logger()
 
+_response_cache: Optional[PersistentLRUCache] = None
+
+
+def get_response_cache(create: bool = True) -> Optional[PersistentLRUCache]:
+    """
+    Process-wide LLM response cache (None when LLM_CACHE_ENABLED is off,
+    or when ``create`` is False and nothing has used it yet)
+    """
+    global _response_cache
+    if _response_cache is None and create and Config.LLM_CACHE_ENABLED:
+        _response_cache = PersistentLRUCache(
+            Config.LLM_CACHE_PATH or None,
+            max_entries=Config.LLM_CACHE_SIZE,
+            max_disk_entries=Config.LLM_CACHE_DISK_SIZE,
+            table="llm_responses",
+            ttl=Config.LLM_CACHE_TTL or None,
+        )
+    return _response_cache
+
+
+FIELD_DESCRIPTIONS = {
+    "issuer": "Bank/Card issuer name",
+    "card_last_4": "Last 4 digits of card number",
+    "statement_period": "Billing cycle",
+    "due_date": "Payment due date",
+    "total_amount_due": "Total amount due (numeric only)",
+}
+
+# Lines matching these labels (plus their neighbours) are sent for a field
+FIELD_LABELS = {
+    "issuer": re.compile(r"bank|card|express", re.IGNORECASE),
+    "card_last_4": re.compile(r"card|ending|xxxx|\*{4}|account", re.IGNORECASE),
+    "statement_period": re.compile(r"period|statement|billing|cycle|from", re.IGNORECASE),
+    "due_date": re.compile(r"due|pay\s*by|payment", re.IGNORECASE),
+    "total_amount_due": re.compile(r"total|due|balance|outstanding", re.IGNORECASE),
+}
+
+
+def build_context(text: str, fields: Sequence[str]) -> str:
+    """
+    Compact LLM context for ``fields``: the statement header plus the lines
+    around matching labels anywhere in the document, capped at
+    LLM_CONTEXT_MAX_CHARS. Gaps between windows are marked with "...".
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    keep = set(range(min(Config.LLM_CONTEXT_HEADER_LINES, len(lines))))
+
+    radius = Config.LLM_CONTEXT_WINDOW
+    patterns = [FIELD_LABELS[field] for field in fields if field in FIELD_LABELS]
+    for index, line in enumerate(lines):
+        if line and any(pattern.search(line) for pattern in patterns):
+            keep.update(range(max(0, index - radius), min(len(lines), index + radius + 1)))
+
+    parts: List[str] = []
+    size = 0
+    previous = -1
+    for index in sorted(keep):
+        line = lines[index]
+        if not line:
+            continue
+        if size + len(line) > Config.LLM_CONTEXT_MAX_CHARS:
+            break
+        if previous >= 0 and index > previous + 1:
+            parts.append("...")
+        parts.append(line)
+        size += len(line) + 1
+        previous = index
+    return "\n".join(parts)
+
+
+class LLMCallStats:
+    """Process-wide counters for LLM calls (exposed via /llm/stats)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.queue_wait_seconds = 0.0
+        # Cross-document batching (app/llm_batcher.py)
+        self.batches = 0
+        self.batched_documents = 0
+        self.batch_fallbacks = 0
+
+    def incr(self, name: str, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "in_flight": self.in_flight,
+                "queue_wait_seconds": round(self.queue_wait_seconds, 6),
+                "batches": self.batches,
+                "batched_documents": self.batched_documents,
+                "batch_fallbacks": self.batch_fallbacks,
+            }
+
+
+llm_stats = LLMCallStats()
+
+
+class LLMBudget:
+    """
+    LLM fallback calls one API request may still make; every statement of a
+    batch upload draws from the same budget. 0 means no cap.
+    """
+
+    def __init__(self, calls: Optional[int] = None):
+        self.calls = Config.LLM_REQUEST_BUDGET if calls is None else calls
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.calls and self.used >= self.calls:
+                return False
+            self.used += 1
+            return True
+
+_shared_extractor: Optional["LLMExtractor"] = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_extractor() -> "LLMExtractor":
+    """
+    Process-wide LLM extraction service shared by every parser. Built on
+    the first fallback, so processes that never need the LLM never import
+    the Groq SDK or open connections.
+    """
+    global _shared_extractor
+    if _shared_extractor is None:
+        with _shared_lock:
+            if _shared_extractor is None:
+                _shared_extractor = LLMExtractor()
+    return _shared_extractor
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Timeouts, connection errors, 408/409/429/5xx and malformed JSON"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, json.JSONDecodeError)):
+        return True
+    if type(error).__name__ in ("APIConnectionError", "APITimeoutError"):
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status in (408, 409, 429) or status >= 500)
+
+
+def _is_timeout(error: Exception) -> bool:
+    return (isinstance(error, (asyncio.TimeoutError, TimeoutError))
+            or type(error).__name__ == "APITimeoutError")
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    ceiling = min(Config.LLM_BACKOFF_MAX, Config.LLM_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
 
 class LLMExtractor:
     """
@@ -15,40 +186,69 @@ class LLMExtractor:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or Config.GROQ_API_KEY
         self.client = None
+        self.async_client = None
+
+        # Caps in-flight LLM calls so bursts don't trip provider rate limits.
+        # The blocking path shares one semaphore; asyncio ones are per loop.
+        self._sync_limiter = threading.BoundedSemaphore(Config.LLM_MAX_CONCURRENCY)
+        self._async_limiters: Dict[int, asyncio.Semaphore] = {}
 
         if not self.api_key:
             logger.warning("no_groq_api_key", message="LLM fallback disabled")
             return
 
         try:
-            from groq import Groq
-            self.client = Groq(api_key=self.api_key)
+            import httpx
+            from groq import AsyncGroq, Groq
+
+            # One keep-alive connection pool per client, sized to the
+            # concurrency cap. Retries are ours (MAX_RETRIES with jittered
+            # backoff), not the SDK's.
+            limits = httpx.Limits(
+                max_connections=Config.LLM_MAX_CONCURRENCY,
+                max_keepalive_connections=Config.LLM_MAX_CONCURRENCY,
+                keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY,
+            )
+            self.client = Groq(
+                api_key=self.api_key, base_url=Config.GROQ_BASE_URL,
+                timeout=Config.LLM_TIMEOUT, max_retries=0,
+                http_client=httpx.Client(limits=limits, timeout=Config.LLM_TIMEOUT),
+            )
+            self.async_client = AsyncGroq(
+                api_key=self.api_key, base_url=Config.GROQ_BASE_URL,
+                timeout=Config.LLM_TIMEOUT, max_retries=0,
+                http_client=httpx.AsyncClient(limits=limits, timeout=Config.LLM_TIMEOUT),
+            )
 
             logger.info(
                 "groq_initialized",
-                model=Config.DEFAULT_MODEL
+                model=Config.DEFAULT_MODEL,
+                base_url=Config.GROQ_BASE_URL
             )
 
         except Exception as e:
             logger.error("groq_init_failed", error=str(e))
             self.client = None
+            self.async_client = None
 
-    def extract_fields(self, text: str, issuer: Optional[str] = None) -> Dict:
-        if not self.client:
-            raise ValueError("Groq client not initialized")
+    def _async_limiter(self) -> asyncio.Semaphore:
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._async_limiters:
+            self._async_limiters[loop_id] = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
+        return self._async_limiters[loop_id]
 
-        text_sample = text[:6000]
+    def _build_prompt(self, text: str, issuer: Optional[str] = None,
+                      fields: Optional[Sequence[str]] = None) -> str:
+        fields = [field for field in (fields or FIELD_DESCRIPTIONS) if field in FIELD_DESCRIPTIONS]
+        schema = ",\n".join(f'  "{field}": "{FIELD_DESCRIPTIONS[field]}"' for field in fields)
+        context = build_context(text, fields)
 
-        prompt = f"""
-Extract the following information from this credit card statement.
+        return f"""
+Extract the following information from this credit card statement excerpt.
 Return ONLY valid JSON. No explanation.
 
 {{
-  "issuer": "Bank/Card issuer name",
-  "card_last_4": "Last 4 digits of card number",
-  "statement_period": "Billing cycle",
-  "due_date": "Payment due date",
-  "total_amount_due": "Total amount due (numeric only)"
+{schema}
 }}
 
 Rules:
@@ -58,31 +258,160 @@ Rules:
 {f"- Issuer is likely {issuer}" if issuer else ""}
 
 Statement Text:
-{text_sample}
+{context}
 """.strip()
 
+    def _request(self, model: str, prompt: str) -> Dict:
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": "You are a precise financial document parser."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0,
+        }
+
+    def _parse_response(self, response) -> tuple:
+        content = response.choices[0].message.content.strip()
+        content = content.replace("```json", "").replace("```", "").strip()
         try:
-            response = self.client.chat.completions.create(
-                model=Config.DEFAULT_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a precise financial document parser."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0,
-            )
+            return content, json.loads(content)
+        except json.JSONDecodeError:
+            logger.error("llm_json_parse_error", response=content[:300])
+            raise
+
+    @staticmethod
+    def _cache_key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
 
-            content = response.choices[0].message.content.strip()
-            content = content.replace("```json", "").replace("```", "").strip()
+    def _cache_lookup(self, use_cache: bool, model: str, prompt: str) -> tuple:
+        cache = get_response_cache() if use_cache else None
+        cache_key = self._cache_key(model, prompt)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                data = json.loads(cached)["data"]
+                logger.info("llm_cache_hit", fields=list(data.keys()))
+                return cache, cache_key, data
+        return cache, cache_key, None
 
-            data = json.loads(content)
+    def _on_attempt_failed(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; return the backoff delay, or None to give up"""
+        if _is_timeout(error):
+            llm_stats.incr("timeouts")
+        if attempt >= Config.MAX_RETRIES or not _is_retryable(error):
+            llm_stats.incr("failures")
+            logger.error("llm_extraction_failed", error=str(error), attempts=attempt + 1)
+            return None
+        delay = _backoff_delay(attempt)
+        llm_stats.incr("retries")
+        logger.warning("llm_call_retry", error=str(error), attempt=attempt + 1,
+                       backoff_s=round(delay, 3))
+        return delay
 
-            logger.info("llm_extraction_success", fields=list(data.keys()))
+    def extract_fields(self, text: str, issuer: Optional[str] = None,
+                       use_cache: bool = True,
+                       fields: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Ask the LLM for ``fields`` (default: all five) from the relevant parts
+        of ``text`` (blocking). Identical prompts are answered from the
+        response cache unless ``use_cache`` is False.
+        """
+        if not self.client:
+            raise ValueError("Groq client not initialized")
+
+        model = Config.DEFAULT_MODEL
+        prompt = self._build_prompt(text, issuer, fields)
+        cache, cache_key, data = self._cache_lookup(use_cache, model, prompt)
+        if data is not None:
             return data
 
-        except json.JSONDecodeError as e:
-            logger.error("llm_json_parse_error", error=str(e), response=content[:300])
-            raise
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            with self._sync_limiter:
+                queue_wait = time.perf_counter() - queued_at
+                llm_stats.incr("queue_wait_seconds", queue_wait)
+                llm_stats.incr("calls")
+                llm_stats.incr("in_flight")
+                try:
+                    response = self.client.chat.completions.create(**self._request(model, prompt))
+                    content, data = self._parse_response(response)
+                    break
+                except Exception as e:
+                    error = e
+                finally:
+                    llm_stats.incr("in_flight", -1)
 
-        except Exception as e:
-            logger.error("llm_extraction_failed", error=str(e))
-            raise
+            delay = self._on_attempt_failed(error, attempt)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+        if cache is not None:
+            cache.set(cache_key, json.dumps({"raw": content, "data": data}))
+
+        logger.info("llm_extraction_success", fields=list(data.keys()),
+                    attempts=attempt + 1, queue_wait_ms=round(queue_wait * 1000, 2))
+        return data
+
+    async def extract_fields_async(self, text: str, issuer: Optional[str] = None,
+                                   use_cache: bool = True,
+                                   fields: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Non-blocking variant of ``extract_fields`` with a hard per-call
+        timeout (LLM_TIMEOUT), jittered exponential backoff up to MAX_RETRIES
+        and at most LLM_MAX_CONCURRENCY calls in flight.
+        """
+        if not self.async_client:
+            raise ValueError("Groq client not initialized")
+
+        model = Config.DEFAULT_MODEL
+        prompt = self._build_prompt(text, issuer, fields)
+        # The cache is SQLite-backed; keep its disk I/O off the event loop
+        cache, cache_key, data = await asyncio.to_thread(self._cache_lookup, use_cache, model, prompt)
+        if data is not None:
+            return data
+
+        content, data = await self.complete_async(model, prompt)
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, json.dumps({"raw": content, "data": data}))
+        return data
+
+    async def complete_async(self, model: str, prompt: str) -> tuple:
+        """
+        One chat completion for ``prompt`` with the timeout, retry and
+        concurrency rules of ``extract_fields_async``; returns the raw
+        content and the parsed JSON
+        """
+        limiter = self._async_limiter()
+        attempt = 0
+        while True:
+            queued_at = time.perf_counter()
+            async with limiter:
+                queue_wait = time.perf_counter() - queued_at
+                llm_stats.incr("queue_wait_seconds", queue_wait)
+                llm_stats.incr("calls")
+                llm_stats.incr("in_flight")
+                try:
+                    response = await asyncio.wait_for(
+                        self.async_client.chat.completions.create(**self._request(model, prompt)),
+                        timeout=Config.LLM_TIMEOUT
+                    )
+                    content, data = self._parse_response(response)
+                    break
+                except Exception as e:
+                    error = e
+                finally:
+                    llm_stats.incr("in_flight", -1)
+
+            delay = self._on_attempt_failed(error, attempt)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        logger.info("llm_extraction_success", fields=list(data.keys()),
+                    attempts=attempt + 1, queue_wait_ms=round(queue_wait * 1000, 2))
+        return content, data
@@ -0,0 +1,54 @@
+import os
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class MemoryLimitExceeded(Exception):
+    """A statement grew the process past its memory ceiling"""
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable, 0 if unknown)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryGuard:
+    """
+    Per-request memory ceiling: ``check()`` raises MemoryLimitExceeded once
+    RSS has grown more than ``limit_mb`` since the guard was created.
+    Measured as growth rather than absolute RSS so memory the allocator
+    keeps from earlier requests doesn't count against later ones.
+    A limit of 0 disables the check.
+
+    RSS is the whole process's, so the guard is only meaningful where one
+    statement is parsed at a time: a process pool worker, or the CLI. The
+    pipeline turns it off under the thread executor, where concurrent
+    parses would count against each other.
+    """
+
+    def __init__(self, limit_mb: float = 0):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self.baseline: Optional[int] = rss_bytes() if self.limit else None
+
+    def check(self, where: str = ""):
+        if not self.limit:
+            return
+        grown = rss_bytes() - self.baseline
+        if grown > self.limit:
+            raise MemoryLimitExceeded(
+                f"Statement exceeds the {self.limit / (1024 * 1024):.0f}MB memory limit"
+                + (f" ({where})" if where else "")
+            )
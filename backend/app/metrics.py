@@ -0,0 +1,194 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Stage latencies span ~0.1ms (regex) to tens of seconds (LLM, big PDFs)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    TYPE = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts incl. +Inf, sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics rendered in the Prometheus text format. Collectors are callables
+    returning extra ``(name, type, help, value)`` samples read at scrape time
+    (cache and LLM counters that already live elsewhere).
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterator[Tuple[str, str, str, float]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterator[Tuple[str, str, str, float]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, help_text, value in collector():
+                lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}",
+                              f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Per-request wall time by pipeline stage, in milliseconds. Spans with the
+    same name accumulate (e.g. text extraction across pages). A plain dict
+    underneath, so it pickles back from pool workers.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def merge(self, timings: Dict[str, float]):
+        for stage, elapsed in timings.items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+
+registry = Registry()
+
+stage_seconds = registry.register(Histogram(
+    "statement_stage_seconds", "Time spent per pipeline stage", ("stage", "issuer")))
+request_seconds = registry.register(Histogram(
+    "http_request_seconds", "HTTP request latency", ("path", "status")))
+fields_total = registry.register(Counter(
+    "statement_fields_total", "Fields returned, by extraction method (none = not found)",
+    ("issuer", "field", "method")))
+statements_total = registry.register(Counter(
+    "statements_parsed_total", "Statements parsed (cache hits excluded)", ("issuer",)))
+llm_fallback_total = registry.register(Counter(
+    "statement_llm_fallback_total", "Statements that needed the LLM fallback", ("issuer",)))
+llm_fields_total = registry.register(Counter(
+    "statement_llm_fields_total",
+    "Fields sent to the LLM fallback (missing, or present below the confidence threshold)",
+    ("issuer", "field", "reason")))
+llm_calls_avoided_total = registry.register(Counter(
+    "statement_llm_calls_avoided_total",
+    "LLM fallback calls skipped for a statement with fields missing "
+    "(none below the confidence threshold, or request budget spent)",
+    ("issuer", "reason")))
+in_flight_requests = registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled"))
+
+
+def record_statement(issuer: str, timings: Dict[str, float], statement) -> None:
+    """Fold one parsed statement's stage timings and field methods into the metrics"""
+    statements_total.inc(issuer=issuer)
+    if statement.fallback_used:
+        llm_fallback_total.inc(issuer=issuer)
+    for stage, elapsed_ms in timings.items():
+        stage_seconds.observe(elapsed_ms / 1000, stage=stage, issuer=issuer)
+    for field in ("issuer", "card_last_4", "statement_period", "due_date", "total_amount_due"):
+        parsed = getattr(statement, field)
+        method = parsed.extraction_method if parsed.value else "none"
+        fields_total.inc(issuer=issuer, field=field, method=method)
@@ -0,0 +1,138 @@
+import importlib
+import importlib.util
+import os
+import threading
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Optional
+import structlog
+
+from app.config import Config
+
+if TYPE_CHECKING:
+    from app.parsers.base_parser import BaseParser
+
+logger = structlog.get_logger()
+
+# Third-party packages register parsers under this entry point group, e.g.
+#   [project.entry-points."statement_parser.parsers"]
+#   KOTAK = "kotak_parser:KotakParser"
+ENTRY_POINT_GROUP = "statement_parser.parsers"
+
+
+class ParserInfo:
+    """
+    Registry metadata for one issuer: everything the API needs to list the
+    issuer without importing its parser module.
+
+    Built-in issuers keep their pattern spec (field and detection patterns)
+    in PATTERN_DIR. A plugin ships its own: ``pattern_file``, by default the
+    ``.yaml`` file next to the parser module (``kotak_parser.py`` ->
+    ``kotak_parser.yaml``).
+    """
+
+    def __init__(self, code: str, path: str, name: Optional[str] = None,
+                 source: str = "builtin", pattern_file: Optional[str] = None):
+        self.code = code
+        self.path = path  # "package.module:ClassName"
+        self.name = name or code
+        self.source = source  # builtin, entry_point or config
+        self._pattern_file = pattern_file
+
+    @property
+    def pattern_file(self) -> Optional[str]:
+        """The plugin's pattern spec, if it has one (None for built-ins)"""
+        if self._pattern_file is None and self.source != "builtin":
+            self._pattern_file = _module_sibling(self.path.partition(":")[0], ".yaml") or ""
+        return self._pattern_file or None
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"code": self.code, "name": self.name, "source": self.source}
+
+    def load_class(self):
+        module_name, _, class_name = self.path.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+def _module_sibling(module_name: str, suffix: str) -> Optional[str]:
+    """Path of the file next to a module's source with ``suffix``, if it exists
+    (locates the module without executing it; parent packages are imported)"""
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin:
+        return None
+    path = os.path.splitext(spec.origin)[0] + suffix
+    return path if os.path.isfile(path) else None
+
+
+BUILTIN_PARSERS = [
+    ParserInfo("HDFC", "app.parsers.hdfc_parser:HDFCParser", "HDFC Bank"),
+    ParserInfo("ICICI", "app.parsers.icici_parser:ICICIParser", "ICICI Bank"),
+    ParserInfo("SBI", "app.parsers.sbi_parser:SBIParser", "SBI Card"),
+    ParserInfo("AXIS", "app.parsers.axis_parser:AxisParser", "Axis Bank"),
+    ParserInfo("AMEX", "app.parsers.amex_parser:AmexParser", "American Express"),
+]
+
+
+class ParserRegistry:
+    """
+    Issuer code -> parser, from the built-in list, installed entry points
+    and PARSER_PLUGINS (later sources override earlier ones). Discovery
+    only reads metadata; a parser module is imported, and its single
+    instance per process built, the first time ``get()`` asks for it.
+    """
+
+    def __init__(self, infos: Optional[List[ParserInfo]] = None):
+        if infos is None:
+            infos = BUILTIN_PARSERS + self._discover()
+        self._infos: Dict[str, ParserInfo] = {info.code: info for info in infos}
+        self._instances: Dict[str, "BaseParser"] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _discover() -> List[ParserInfo]:
+        infos = [ParserInfo(ep.name, ep.value, source="entry_point")
+                 for ep in entry_points(group=ENTRY_POINT_GROUP)]
+        infos += [ParserInfo(code, path, source="config")
+                  for code, path in Config.PARSER_PLUGINS.items()]
+        return infos
+
+    def codes(self) -> List[str]:
+        return list(self._infos)
+
+    def infos(self) -> List[ParserInfo]:
+        return list(self._infos.values())
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._infos
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def get(self, code: str) -> Optional["BaseParser"]:
+        """This process's parser for ``code`` (None for unknown issuers)"""
+        parser = self._instances.get(code)
+        if parser is not None or code not in self._infos:
+            return parser
+        with self._lock:
+            if code not in self._instances:
+                info = self._infos[code]
+                self._instances[code] = info.load_class()()
+                logger.info("parser_loaded", issuer=code, path=info.path)
+            return self._instances[code]
+
+    def loaded(self) -> List[str]:
+        """Issuers whose parser has been built in this process"""
+        return list(self._instances)
+
+
+_registry: Optional[ParserRegistry] = None
+
+
+def get_parser_registry() -> ParserRegistry:
+    """Process-wide registry (each pool worker keeps its own)"""
+    global _registry
+    if _registry is None:
+        _registry = ParserRegistry()
+    return _registry
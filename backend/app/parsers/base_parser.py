@@ -1,106 +1,282 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from abc import ABC
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 import structlog
-from app.schemas import ParsedField, StatementData
 from app.validators import FieldValidator
 from app.config import Config
+from app.memory import MemoryLimitExceeded
+from app import metrics
+from app.metrics import StageTimer
+from app.pattern_registry import get_pattern_registry
+
+# pydantic models are only needed to build the final result, which pool
+# workers never do; importing them lazily keeps worker startup light
+if TYPE_CHECKING:
+    from app.schemas import StatementData
 
 logger = structlog.get_logger()
 
+# Fields every statement reports, in response order
+FIELDS = ["issuer", "card_last_4", "statement_period", "due_date", "total_amount_due"]
+
 class BaseParser(ABC):
-    """Enhanced base parser with multi-strategy extraction"""
+    """
+    Enhanced base parser with multi-strategy extraction.
+
+    Regex patterns live in ``app/patterns/<issuer>.yaml`` and are run by the
+    generic engine in ``extract_with_regex``; subclasses set ``ISSUER`` and
+    only override methods for issuer-specific behaviour.
+    """
+
+    # Issuer code of the pattern spec to use (e.g. "HDFC")
+    ISSUER: str = ""
+
+    # 0-based pages handed to extract_with_tables; None means every page
+    TABLE_PAGES: Optional[Tuple[int, ...]] = None
     
     def __init__(self):
         self.validator = FieldValidator()
-        # Only import and instantiate LLM extractor when configured to use it.
-        if Config.USE_LLM_FALLBACK:
-            from app.llm_extractor import LLMExtractor
-            self.llm_extractor = LLMExtractor()
-        else:
-            self.llm_extractor = None
     
-    @abstractmethod
-    def extract_with_regex(self, text: str) -> Dict:
-        """Issuer-specific regex extraction"""
-        pass
+    @property
+    def llm_extractor(self):
+        """Shared LLM service, built on first use (None when fallback is off)"""
+        if not Config.USE_LLM_FALLBACK:
+            return None
+        from app.llm_extractor import get_llm_extractor
+        return get_llm_extractor()
+    
+    def _async_llm_client(self):
+        """The LLM extractor, or the cross-document batcher over it (LLM_BATCH_ENABLED)"""
+        if Config.LLM_BATCH_ENABLED and self.llm_extractor is not None:
+            from app.llm_batcher import get_llm_batcher
+            return get_llm_batcher()
+        return self.llm_extractor
+    
+    def extract_with_regex(self, text: str, fields: Optional[list] = None) -> Dict:
+        """
+        Run the issuer's precompiled pattern spec over the text
+        (only the patterns of ``fields`` when given)
+        """
+        spec = get_pattern_registry().get(self.ISSUER)
+        if spec is None:
+            raise ValueError(f"No pattern spec for issuer {self.ISSUER}")
+        
+        result = {
+            "issuer": {
+                "value": spec.display_name,
+                "method": "regex"
+            }
+        }
+        
+        for field_name, field_spec in spec.fields.items():
+            if fields is not None and field_name not in fields:
+                continue
+            value = field_spec.extract(text)
+            if value is not None:
+                result[field_name] = {
+                    "value": value,
+                    "method": "regex"
+                }
+        
+        return result
     
     def extract_with_tables(self, tables: list) -> Dict:
         """Extract from tables (override if needed)"""
         return {}
     
-    def parse(self, text: str, tables: list = None) -> StatementData:
+    def parse(self, text: str, tables=None) -> "StatementData":
         """
         Multi-strategy parsing pipeline
         1. Try regex
-        2. Try tables
+        2. Try tables (only if regex left fields empty)
         3. Fallback to LLM if needed
+
+        ``tables`` may be a list of already extracted tables or a lazy
+        ``TableProvider``; the provider is only materialized for
+        ``TABLE_PAGES`` when the table stage actually runs.
+        """
+        result, errors = self.extract(text, tables)
+        fallback_used = self.apply_llm_fallback(text, result, errors)
+        
+        # Convert to ParsedField objects with validation
+        return self._build_statement_data(result, errors, fallback_used)
+    
+    def extract(self, text: str, tables=None,
+                timer: Optional[StageTimer] = None,
+                regex_result: Optional[Dict] = None) -> Tuple[Dict, list]:
+        """
+        CPU-bound stages of the pipeline (regex, then tables).
+        ``regex_result`` is a regex pass already made over ``text`` (the
+        streaming page reader's), used instead of running one again.
         """
+        timer = timer or StageTimer()
         result = {}
         errors = []
-        fallback_used = False
         
         # Strategy 1: Regex
-        try:
-            regex_data = self.extract_with_regex(text)
-            result.update(regex_data)
-            logger.info("regex_extraction_completed", fields=list(regex_data.keys()))
-        except Exception as e:
-            errors.append(f"Regex extraction failed: {str(e)}")
-            logger.warning("regex_extraction_failed", error=str(e))
+        if regex_result is not None:
+            result.update(regex_result)
+        else:
+            try:
+                with timer.span("regex"):
+                    regex_data = self.extract_with_regex(text)
+                result.update(regex_data)
+                logger.info("regex_extraction_completed", fields=list(regex_data.keys()))
+            except Exception as e:
+                errors.append(f"Regex extraction failed: {str(e)}")
+                logger.warning("regex_extraction_failed", error=str(e))
         
         # Strategy 2: Tables
-        if tables:
+        if tables is not None and self._uses_tables() and self._get_missing_fields(result):
             try:
-                table_data = self.extract_with_tables(tables)
-                result.update(table_data)
+                with timer.span("tables"):
+                    if hasattr(tables, "get"):
+                        tables = tables.get(self.TABLE_PAGES)
+                    if tables:
+                        table_data = self.extract_with_tables(tables)
+                        result.update(table_data)
+            except MemoryLimitExceeded:
+                # The statement is over its memory ceiling; fail it rather
+                # than carry on parsing as if tables were merely missing
+                raise
             except Exception as e:
                 errors.append(f"Table extraction failed: {str(e)}")
         
-        # Strategy 3: LLM Fallback
-        missing_fields = self._get_missing_fields(result)
-        if missing_fields and Config.USE_LLM_FALLBACK and self.llm_extractor:
-            try:
-                logger.info("using_llm_fallback", missing_fields=missing_fields)
-                llm_data = self.llm_extractor.extract_fields(text)
-                
-                # Fill missing fields with LLM data
-                for field in missing_fields:
-                    if field in llm_data and llm_data[field]:
-                        result[field] = {
-                            "value": llm_data[field],
-                            "method": "llm"
-                        }
-                
-                fallback_used = True
-                logger.info("llm_fallback_completed")
-            except Exception as e:
-                errors.append(f"LLM fallback failed: {str(e)}")
-                logger.error("llm_fallback_failed", error=str(e))
+        return result, errors
+    
+    def apply_llm_fallback(self, text: str, result: Dict, errors: list,
+                           budget=None) -> bool:
+        """
+        Strategy 3: re-extract fields below the confidence threshold
+        (missing ones included) with the LLM, drawing one call from
+        ``budget`` (an ``LLMBudget``) when given.
+        Blocking network I/O; returns whether the fallback was used.
+        """
+        llm_fields = self._llm_fields(result, budget, errors)
+        if not llm_fields:
+            return False
         
-        # Convert to ParsedField objects with validation
-        return self._build_statement_data(result, errors, fallback_used)
+        try:
+            logger.info("using_llm_fallback", fields=llm_fields)
+            llm_data = self.llm_extractor.extract_fields(
+                text, issuer=self._issuer_hint(result), fields=llm_fields
+            )
+        except Exception as e:
+            errors.append(f"LLM fallback failed: {str(e)}")
+            logger.error("llm_fallback_failed", error=str(e))
+            return False
+        
+        self._merge_llm_data(result, llm_fields, llm_data)
+        return True
     
+    async def apply_llm_fallback_async(self, text: str, result: Dict, errors: list,
+                                       budget=None) -> bool:
+        """Non-blocking ``apply_llm_fallback`` for use on the event loop"""
+        llm_fields = self._llm_fields(result, budget, errors)
+        if not llm_fields:
+            return False
+        
+        try:
+            logger.info("using_llm_fallback", fields=llm_fields)
+            llm_data = await self._async_llm_client().extract_fields_async(
+                text, issuer=self._issuer_hint(result), fields=llm_fields
+            )
+        except Exception as e:
+            errors.append(f"LLM fallback failed: {str(e)}")
+            logger.error("llm_fallback_failed", error=str(e))
+            return False
+        
+        self._merge_llm_data(result, llm_fields, llm_data)
+        return True
+    
+    @property
+    def confidence_threshold(self) -> float:
+        """Fields scoring below this go to the LLM (CONFIDENCE_THRESHOLD[_BY_ISSUER])"""
+        return Config.CONFIDENCE_THRESHOLD_BY_ISSUER.get(self.ISSUER, Config.CONFIDENCE_THRESHOLD)
+    
+    def _field_confidences(self, result: Dict) -> Dict[str, float]:
+        """Validated confidence of every field (missing = 0)"""
+        confidences = {}
+        for field in FIELDS:
+            field_data = result.get(field, {})
+            confidences[field] = self._calculate_confidence(
+                field, field_data.get("value"), field_data.get("method", "regex"))
+        return confidences
+    
+    def _fields_below_threshold(self, result: Dict) -> list:
+        """Fields whose validated confidence is under the threshold (missing = 0)"""
+        threshold = self.confidence_threshold
+        return [field for field, confidence in self._field_confidences(result).items()
+                if confidence < threshold]
+    
+    def _llm_fields(self, result: Dict, budget=None, errors: Optional[list] = None) -> list:
+        """
+        Fields to ask the LLM for (empty when the fallback is off or not
+        worth a call). Fields skipped because ``budget`` is spent are
+        reported in ``errors``, so the incomplete result isn't cached.
+        """
+        if not Config.USE_LLM_FALLBACK:
+            return []
+        fields = self._fields_below_threshold(result)
+        missing = self._get_missing_fields(result)
+        if not fields:
+            # Only a call that asking for missing fields would have made
+            # counts as saved; a complete statement never needed one
+            if missing:
+                metrics.llm_calls_avoided_total.inc(issuer=self.ISSUER, reason="threshold")
+            return []
+        if budget is not None and not budget.try_spend():
+            logger.info("llm_budget_exhausted", fields=fields)
+            metrics.llm_calls_avoided_total.inc(issuer=self.ISSUER, reason="budget")
+            if errors is not None:
+                errors.append(f"LLM fallback skipped, request budget exhausted: {', '.join(fields)}")
+            return []
+        for field in fields:
+            metrics.llm_fields_total.inc(issuer=self.ISSUER, field=field,
+                                         reason="missing" if field in missing else "low_confidence")
+        return fields
+    
+    def _issuer_hint(self, result: Dict) -> Optional[str]:
+        return result.get("issuer", {}).get("value")
+    
+    def _merge_llm_data(self, result: Dict, llm_fields: list, llm_data: Dict):
+        # Take the LLM's value where the field was missing or it scores higher
+        for field in llm_fields:
+            value = llm_data.get(field)
+            if not value:
+                continue
+            current = result.get(field, {})
+            current_confidence = self._calculate_confidence(
+                field, current.get("value"), current.get("method", "regex"))
+            if self._calculate_confidence(field, value, "llm") > current_confidence:
+                result[field] = {
+                    "value": value,
+                    "method": "llm"
+                }
+        
+        logger.info("llm_fallback_completed")
+    
+    def _uses_tables(self) -> bool:
+        """Whether this parser overrides the table strategy at all"""
+        return type(self).extract_with_tables is not BaseParser.extract_with_tables
+
     def _get_missing_fields(self, result: Dict) -> list:
         """Identify missing fields"""
-        required = ["issuer", "card_last_4", "statement_period", 
-                   "due_date", "total_amount_due"]
-        
         missing = []
-        for field in required:
+        for field in FIELDS:
             if field not in result or not result[field].get("value"):
                 missing.append(field)
         
         return missing
     
     def _build_statement_data(self, result: Dict, errors: list, 
-                              fallback_used: bool) -> StatementData:
+                              fallback_used: bool) -> "StatementData":
         """Build StatementData with confidence scores"""
+        from app.schemas import ParsedField, StatementData
         
         parsed_fields = {}
         confidences = []
         
-        for field_name in ["issuer", "card_last_4", "statement_period", 
-                          "due_date", "total_amount_due"]:
+        for field_name in FIELDS:
             
             field_data = result.get(field_name, {})
             value = field_data.get("value")
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import structlog
+
+from app.config import Config
+
+logger = structlog.get_logger()
+
+# Post-processing applied to a field's matched value
+TRANSFORMS: Dict[str, Callable[[str], str]] = {
+    "strip": str.strip,
+    "amount": lambda value: value.replace(",", ""),
+    "last4": lambda value: value[-4:],
+}
+
+
+class FieldSpec:
+    """Compiled patterns for one field, tried in order; first match wins"""
+
+    def __init__(self, name: str, spec: Dict):
+        self.name = name
+        flags = 0 if spec.get("case_sensitive") else re.IGNORECASE
+        self.patterns: List[re.Pattern] = [re.compile(p, flags) for p in spec["patterns"]]
+        # Two captured groups (e.g. a period's start and end) are joined
+        self.join: str = spec.get("join", " to ")
+        transform = spec.get("transform", "strip")
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unknown transform '{transform}' for field '{name}'")
+        self.transform = TRANSFORMS[transform]
+
+    def extract(self, text: str) -> Optional[str]:
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                if match.lastindex == 2:
+                    value = f"{match.group(1)}{self.join}{match.group(2)}"
+                else:
+                    value = match.group(1)
+                return self.transform(value.strip())
+        return None
+
+
+class IssuerSpec:
+    """Declarative per-issuer extraction spec loaded from ``app/patterns``"""
+
+    def __init__(self, spec: Dict):
+        self.issuer: str = spec["issuer"]
+        self.display_name: str = spec["display_name"]
+        # Issuer detection patterns (IssuerDetector), matched on lowercased text
+        self.detect: List[str] = list(spec.get("detect") or [])
+        self.fields: Dict[str, FieldSpec] = {
+            name: FieldSpec(name, field_spec)
+            for name, field_spec in (spec.get("fields") or {}).items()
+        }
+
+
+class PatternRegistry:
+    """
+    Loads every ``*.yaml`` spec in ``directory``, plus ``extra_files`` (the
+    specs plugin parsers ship), and compiles the patterns once. Files are
+    re-checked at most every ``reload_interval`` seconds and changed ones
+    are recompiled in place, so pattern fixes ship without a restart. A
+    spec that fails to load keeps its previous version.
+    """
+
+    def __init__(self, directory: str = Config.PATTERN_DIR,
+                 reload_interval: float = Config.PATTERN_RELOAD_INTERVAL,
+                 extra_files: Sequence[str] = ()):
+        self.directory = Path(directory)
+        self.extra_files = [Path(path) for path in extra_files]
+        self.reload_interval = reload_interval
+        self._specs: Dict[str, IssuerSpec] = {}
+        self._files: Dict[Path, tuple] = {}  # path -> (mtime_ns, issuer, sha256)
+        self._checked_at = 0.0
+        # Bumped whenever a spec is loaded or removed
+        self.generation = 0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def get(self, issuer: str) -> Optional[IssuerSpec]:
+        self._maybe_reload()
+        return self._specs.get(issuer)
+
+    def issuers(self) -> List[str]:
+        self._maybe_reload()
+        return list(self._specs)
+
+    def specs(self) -> Dict[str, IssuerSpec]:
+        self._maybe_reload()
+        return dict(self._specs)
+
+    def fingerprint(self) -> str:
+        """Digest of the loaded pattern files (part of the result cache key)"""
+        self._maybe_reload()
+        digest = hashlib.sha256()
+        for path in sorted(self._files):
+            digest.update(self._files[path][2].encode())
+        return digest.hexdigest()[:12]
+
+    def _maybe_reload(self):
+        if self.reload_interval <= 0:
+            return
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def reload(self):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            paths = sorted(self.directory.glob("*.yaml"))
+            paths += [path for path in self.extra_files if path.is_file()]
+
+            for path in set(self._files) - set(paths):
+                _, issuer, _ = self._files.pop(path)
+                self._specs.pop(issuer, None)
+                self.generation += 1
+                logger.info("patterns_removed", issuer=issuer, file=path.name)
+
+            for path in paths:
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                if path in self._files and self._files[path][0] == mtime:
+                    continue
+                self._load_file(path, mtime)
+
+    def _load_file(self, path: Path, mtime: int):
+        try:
+            import yaml  # only needed when a spec (re)loads
+            raw = path.read_bytes()
+            spec = IssuerSpec(yaml.safe_load(raw))
+        except Exception as e:
+            logger.error("patterns_load_failed", file=path.name, error=str(e))
+            # Keep serving the previous spec; don't retry until the file changes
+            if path in self._files:
+                _, issuer, digest = self._files[path]
+                self._files[path] = (mtime, issuer, digest)
+            return
+
+        reloaded = path in self._files
+        self._specs[spec.issuer] = spec
+        self._files[path] = (mtime, spec.issuer, hashlib.sha256(raw).hexdigest())
+        self.generation += 1
+        logger.info("patterns_reloaded" if reloaded else "patterns_loaded",
+                    issuer=spec.issuer, file=path.name)
+
+
+_registry: Optional[PatternRegistry] = None
+
+
+def get_pattern_registry() -> PatternRegistry:
+    """
+    Process-wide registry (each pool worker keeps its own), including the
+    pattern specs of registered plugin parsers
+    """
+    global _registry
+    if _registry is None:
+        from app.parser_registry import get_parser_registry
+
+        plugin_files = [info.pattern_file for info in get_parser_registry().infos()
+                        if info.pattern_file]
+        _registry = PatternRegistry(extra_files=plugin_files)
+    return _registry
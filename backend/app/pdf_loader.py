@@ -1,62 +1,298 @@
-import pdfplumber
-import fitz  # PyMuPDF
-from typing import Dict, List, Tuple
+import io
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Union
 import structlog
 
+from app.config import Config
+from app.memory import MemoryGuard
+
+# pdfplumber (pdfminer) and PyMuPDF are imported on first use: together they
+# are most of the pipeline's import time
+if TYPE_CHECKING:
+    import fitz
+
 logger = structlog.get_logger()
 
+# Text extraction engines. PyMuPDF is ~50x faster; pdfplumber rebuilds lines
+# from character positions, which some layouts need for a usable reading
+# order. Tables and layout always come from pdfplumber.
+PYMUPDF = "pymupdf"
+PDFPLUMBER = "pdfplumber"
+TEXT_ENGINES = (PYMUPDF, PDFPLUMBER)
+
+
+def text_engine_for(issuer: Optional[str] = None) -> str:
+    """Configured text engine for ``issuer`` (PDF_TEXT_ENGINE_BY_ISSUER, else the default)"""
+    return Config.PDF_TEXT_ENGINE_BY_ISSUER.get(issuer, Config.PDF_TEXT_ENGINE)
+
+
+class PDFPage:
+    """
+    Single page view shared by text, table and layout extraction.
+
+    Text comes from the document's current text engine; tables and layout
+    from the pdfplumber page, whose layout objects are parsed once and
+    reused. Every view caches its own result.
+    """
+
+    def __init__(self, document: "PDFDocument", page_num: int):
+        self._document = document
+        self.page_num: int = page_num
+        self._text: Optional[str] = None
+        self._tables: Optional[List[List[List[str]]]] = None
+        self._layout: Optional[Dict] = None
+
+    @property
+    def _page(self):
+        return self._document.plumber.pages[self.page_num]
+
+    @property
+    def text(self) -> str:
+        if self._text is not None:
+            return self._text
+        if self._document.text_engine == PYMUPDF:
+            text = self._document.mupdf[self.page_num].get_text(sort=True).strip()
+        else:
+            text = self._page.extract_text() or ""
+        # Low-memory mode hands the text over instead of keeping a copy
+        if not self._document.low_memory:
+            self._text = text
+        self._document._page_done(self, "text")
+        return text
+
+    @property
+    def tables(self) -> List[List[List[str]]]:
+        if self._tables is None:
+            try:
+                self._tables = self._page.extract_tables() or []
+            except Exception as e:
+                logger.warning("table_extraction_failed", page=self.page_num, error=str(e))
+                self._tables = []
+            self._document._page_done(self, "tables")
+        return self._tables
+
+    def release(self):
+        """Drop the parsed layout objects pdfplumber caches on this page"""
+        if self._document._plumber is None:
+            return
+        self._page.flush_cache()
+
+    @property
+    def layout(self) -> Dict:
+        if self._layout is None:
+            blocks = [
+                {
+                    "bbox": (line["x0"], line["top"], line["x1"], line["bottom"]),
+                    "text": line["text"],
+                }
+                for line in self._page.extract_text_lines()
+            ]
+            self._layout = {"page_num": self.page_num, "blocks": blocks}
+        return self._layout
+
+
+class PDFDocument:
+    """
+    Bundle returned by ``PDFLoader.load``: each library opens the PDF at most
+    once and all views (text, tables, layout) are served per page from it.
+    Only the text engine's library is opened up front; pdfplumber is opened
+    on the first table or layout access.
+
+    ``low_memory`` (LOW_MEMORY_MODE) releases every page's parsed objects
+    right after use and keeps no page text, so peak memory no longer grows
+    with the page count; MAX_REQUEST_MEMORY_MB raises MemoryLimitExceeded
+    when the document grows RSS past the ceiling.
+    """
+
+    def __init__(self, source: Union[str, bytes], text_engine: str = None,
+                 low_memory: bool = None, memory_limit_mb: float = None):
+        self._source = source
+        self._fitz: Optional["fitz.Document"] = None
+        self._plumber = None
+        self.low_memory = Config.LOW_MEMORY_MODE if low_memory is None else low_memory
+        self._memory = MemoryGuard(Config.MAX_REQUEST_MEMORY_MB
+                                   if memory_limit_mb is None else memory_limit_mb)
+        self.text_engine = text_engine or text_engine_for()
+        if self.text_engine not in TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine {self.text_engine}; expected one of {TEXT_ENGINES}")
+
+        page_count = len(self.mupdf) if self.text_engine == PYMUPDF else len(self.plumber.pages)
+        self.pages: List[PDFPage] = [PDFPage(self, n) for n in range(page_count)]
+
+    @property
+    def mupdf(self) -> "fitz.Document":
+        if self._fitz is None:
+            import fitz  # PyMuPDF
+            if isinstance(self._source, bytes):
+                self._fitz = fitz.open(stream=self._source, filetype="pdf")
+            else:
+                self._fitz = fitz.open(self._source)
+        return self._fitz
+
+    @property
+    def plumber(self):
+        if self._plumber is None:
+            import pdfplumber
+            source = self._source
+            self._plumber = pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+        return self._plumber
+
+    def _page_done(self, page: PDFPage, view: str):
+        """
+        Called after each page extraction: in low-memory mode the page's
+        parsed objects and MuPDF's resource store are released, then the
+        memory ceiling is checked.
+        """
+        if self.low_memory:
+            page.release()
+            if self._fitz is not None:
+                import fitz
+                fitz.TOOLS.store_shrink(100)
+        self._memory.check(f"page {page.page_num + 1} {view}")
+
+    def set_text_engine(self, engine: str) -> bool:
+        """
+        Switch text engines (e.g. once the issuer is known); pages already
+        read are extracted again on next access. Returns True if it changed.
+        """
+        if engine not in TEXT_ENGINES:
+            raise ValueError(f"Unknown text engine {engine}; expected one of {TEXT_ENGINES}")
+        if engine == self.text_engine:
+            return False
+        self.text_engine = engine
+        for page in self.pages:
+            page._text = None
+        return True
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def text(self) -> str:
+        return "".join(text + "\n" for text in self.iter_text() if text)
+
+    def iter_text(self) -> Iterator[str]:
+        """Yield each page's text, extracting a page only when it is reached"""
+        for page in self.pages:
+            yield page.text
+
+    @property
+    def tables(self) -> List[List[List[str]]]:
+        all_tables = []
+        for page in self.pages:
+            all_tables.extend(page.tables)
+        return all_tables
+
+    @property
+    def layout_info(self) -> Dict:
+        return {
+            "page_count": self.page_count,
+            "pages": [page.layout for page in self.pages]
+        }
+
+    def table_provider(self) -> "TableProvider":
+        return TableProvider(self)
+
+    def close(self):
+        if self._fitz is not None:
+            self._fitz.close()
+        if self._plumber is not None:
+            self._plumber.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TableProvider:
+    """
+    Deferred table extraction over an open ``PDFDocument``.
+
+    ``page.extract_tables()`` is the most expensive call in the pipeline, so
+    parsers receive this provider and only materialize the pages they ask for,
+    and only when the regex stage left fields empty.
+    """
+
+    def __init__(self, document: PDFDocument):
+        self._document = document
+        self.materialized_pages: List[int] = []
+
+    def get(self, pages: Optional[Sequence[int]] = None) -> List[List[List[str]]]:
+        """Return tables for the given 0-based page numbers (all pages if None)"""
+        if pages is None:
+            selected = self._document.pages
+        else:
+            selected = [self._document.pages[n] for n in pages
+                        if 0 <= n < self._document.page_count]
+
+        all_tables = []
+        for page in selected:
+            if page.page_num not in self.materialized_pages:
+                self.materialized_pages.append(page.page_num)
+            all_tables.extend(page.tables)
+        return all_tables
+
+
 class PDFLoader:
     """Enhanced PDF extraction with multiple strategies"""
-    
+
+    @staticmethod
+    def load(source: Union[str, bytes], text_engine: str = None,
+             low_memory: bool = None, memory_limit_mb: float = None) -> PDFDocument:
+        """
+        Open the PDF once and return a per-page text/table/layout bundle.
+        ``source`` is a file path or the raw PDF bytes; ``text_engine``,
+        ``low_memory`` and ``memory_limit_mb`` default to PDF_TEXT_ENGINE,
+        LOW_MEMORY_MODE and MAX_REQUEST_MEMORY_MB.
+        """
+        try:
+            return PDFDocument(source, text_engine, low_memory, memory_limit_mb)
+        except Exception as e:
+            logger.error("pdf_open_failed", error=str(e))
+            raise
+
     @staticmethod
     def extract_text(pdf_path: str) -> str:
         """Extract raw text from PDF"""
         try:
-            full_text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
-            return full_text
+            with PDFLoader.load(pdf_path) as doc:
+                return doc.text
         except Exception as e:
             logger.error("text_extraction_failed", error=str(e))
             raise
-    
+
     @staticmethod
     def extract_tables(pdf_path: str) -> List[List[List[str]]]:
         """Extract tables from PDF"""
         try:
-            all_tables = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        all_tables.extend(tables)
-            return all_tables
+            with PDFLoader.load(pdf_path) as doc:
+                return doc.tables
         except Exception as e:
             logger.warning("table_extraction_failed", error=str(e))
             return []
-    
+
     @staticmethod
     def extract_layout_info(pdf_path: str) -> Dict:
         """Extract layout information using PyMuPDF"""
         try:
+            import fitz  # PyMuPDF
             doc = fitz.open(pdf_path)
             layout_info = {
                 "page_count": len(doc),
                 "pages": []
             }
-            
+
             for page_num, page in enumerate(doc):
                 text_dict = page.get_text("dict")
                 layout_info["pages"].append({
                     "page_num": page_num,
                     "blocks": text_dict.get("blocks", [])
                 })
-            
+
             doc.close()
             return layout_info
         except Exception as e:
             logger.warning("layout_extraction_failed", error=str(e))
-            return {"page_count": 0, "pages": []}
\ No newline at end of file
+            return {"page_count": 0, "pages": []}
@@ -0,0 +1,330 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+import structlog
+
+from app import metrics, profiler
+from app.config import Config
+from app.issuer_detector import IssuerDetector
+from app.memory import MemoryLimitExceeded
+from app.metrics import StageTimer
+from app.parser_registry import get_parser_registry
+from app.parsers.base_parser import BaseParser
+from app.pdf_loader import PDFDocument, PDFLoader, text_engine_for
+from app.profiler import RequestProfiler
+
+if TYPE_CHECKING:
+    from app.schemas import StatementData
+
+logger = structlog.get_logger()
+
+
+class PipelineError(Exception):
+    """Statement could not be parsed (reported back to the client as-is)"""
+
+
+def get_parser(issuer: str) -> Optional[BaseParser]:
+    """Return this process's parser instance for ``issuer`` (imported on first use)"""
+    return get_parser_registry().get(issuer)
+
+
+def warmup():
+    """
+    Pay the cold-start costs up front instead of on the first statement:
+    PDF libraries, every parser, the pattern specs and detector regexes.
+    """
+    started = time.perf_counter()
+    import fitz  # noqa: F401
+    import pdfplumber  # noqa: F401
+    from app.pattern_registry import get_pattern_registry
+
+    get_pattern_registry()
+    IssuerDetector._matchers()
+    registry = get_parser_registry()
+    for issuer in registry.codes():
+        registry.get(issuer)
+    logger.info("warmup_completed", elapsed_ms=(time.perf_counter() - started) * 1000)
+
+
+def init_worker():
+    """Process pool initializer (WARMUP_ON_START warms each worker as it spawns)"""
+    if Config.WARMUP_ON_START:
+        warmup()
+
+
+def _read_pages(document: PDFDocument,
+                timer: Optional[StageTimer] = None) -> Tuple[str, Optional[str], float, Dict]:
+    """
+    Streaming read: pages are extracted one at a time, each new page adds
+    to the issuer scores until an issuer appears, and after that is only
+    searched for the fields still below the confidence threshold. Reading
+    stops once every field meets it (the check ``_parse_document`` uses to
+    decide on the LLM fallback), or after ``STREAM_PAGE_BUDGET`` pages
+    (0 = no cap).
+
+    Pages are read with the default text engine until the issuer is known,
+    then with that issuer's engine (PDF_TEXT_ENGINE_BY_ISSUER), re-reading
+    the pages so far if it differs.
+
+    Returns the text of the pages read, the issuer, its confidence and the
+    regex result for that text, which the parser reuses.
+    """
+    timer = timer or StageTimer()
+    budget = Config.STREAM_PAGE_BUDGET
+    chunks = []
+    issuer, issuer_confidence = None, 0.0
+    scores: Dict[str, int] = {}
+    # Best regex result so far, and the fields still below the threshold
+    result, pending = {}, None
+    pages_read = 0
+
+    for pages_read, page in enumerate(document.pages, start=1):
+        with timer.span("text_extraction"):
+            page_text = page.text
+        if page_text:
+            chunks.append(page_text + "\n")
+
+            if issuer is None:
+                with timer.span("issuer_detection"):
+                    for code, score in IssuerDetector.score(page_text).items():
+                        scores[code] = scores.get(code, 0) + score
+                    issuer, issuer_confidence = IssuerDetector.verdict(scores)
+                parser = get_parser(issuer) if issuer else None
+                if parser:
+                    if document.set_text_engine(text_engine_for(issuer)):
+                        with timer.span("text_extraction"):
+                            texts = [page.text for page in document.pages[:pages_read]]
+                        chunks = [text + "\n" for text in texts if text]
+                    text = "".join(chunks)
+                    with timer.span("regex"):
+                        result = parser.extract_with_regex(text)
+                        pending = parser._fields_below_threshold(result)
+            elif parser and pending:
+                with timer.span("regex"):
+                    found = parser.extract_with_regex(page_text, fields=pending)
+                    # A later page may hold a valid value for a weak match
+                    for field, value in found.items():
+                        if field in pending:
+                            candidate = {**result, field: value}
+                            if field not in parser._fields_below_threshold(candidate):
+                                result = candidate
+                    pending = parser._fields_below_threshold(result)
+
+            if issuer and not pending:
+                break
+        if budget and pages_read >= budget:
+            break
+
+    logger.info("pages_streamed", pages_read=pages_read, page_count=document.page_count,
+                issuer=issuer, confidence=issuer_confidence)
+    return "".join(chunks), issuer, issuer_confidence, result
+
+
+def extract_statement(source: Union[str, bytes], submitted_at: Optional[float] = None,
+                      profile_mode: Optional[str] = None,
+                      memory_limit_mb: Optional[float] = None) -> Dict:
+    """
+    CPU-bound part of the pipeline, run inside a pool worker:
+    PDF extraction, issuer detection, regex and table stages.
+
+    With ``STREAMING_EXTRACTION`` pages past the point where every field has
+    been found are never extracted.
+
+    Returns a picklable dict; the statement text is only shipped back when
+    fields are missing or below the confidence threshold and the LLM
+    fallback may need it. ``timings``
+    holds the per-stage milliseconds, including the wait in the pool queue
+    when ``submitted_at`` (a ``time.time()`` stamp) is given.
+
+    ``profile_mode`` (see ``app.profiler.choose_mode``) runs the work under
+    a profiler and writes the profile to PROFILE_DIR. ``memory_limit_mb``
+    overrides MAX_REQUEST_MEMORY_MB (see ``ParsePipeline.memory_limit_mb``).
+    """
+    timer = StageTimer()
+    if submitted_at is not None:
+        timer.timings["queue_wait"] = max(0.0, (time.time() - submitted_at) * 1000)
+
+    info = {"issuer": None, "pages": 0}
+    request_profiler = RequestProfiler(profile_mode)
+    try:
+        with request_profiler:
+            return _extract(source, timer, info, memory_limit_mb)
+    finally:
+        if profile_mode:
+            request_profiler.finish(info["issuer"], info["pages"], timer.timings)
+
+
+def _extract(source: Union[str, bytes], timer: StageTimer, info: Dict,
+             memory_limit_mb: Optional[float] = None) -> Dict:
+    with timer.span("pdf_open"):
+        document = PDFLoader.load(source, memory_limit_mb=memory_limit_mb)
+    try:
+        with document:
+            return _parse_document(document, timer, info)
+    except MemoryLimitExceeded as e:
+        logger.warning("memory_limit_exceeded", issuer=info["issuer"],
+                       pages=info["pages"], error=str(e))
+        raise PipelineError(str(e))
+
+
+def _parse_document(document: PDFDocument, timer: StageTimer, info: Dict) -> Dict:
+    info["pages"] = document.page_count
+    regex_result = None
+    if Config.STREAMING_EXTRACTION:
+        text, issuer, issuer_confidence, regex_result = _read_pages(document, timer)
+    else:
+        with timer.span("text_extraction"):
+            text = document.text
+        with timer.span("issuer_detection"):
+            issuer, issuer_confidence = IssuerDetector.detect(text)
+        if issuer and document.set_text_engine(text_engine_for(issuer)):
+            with timer.span("text_extraction"):
+                text = document.text
+    info["issuer"] = issuer
+    if not issuer:
+        raise PipelineError("Could not detect card issuer")
+
+    parser = get_parser(issuer)
+    if not parser:
+        raise PipelineError(f"Parser not implemented for {issuer}")
+
+    result, errors = parser.extract(text, document.table_provider(), timer,
+                                    regex_result=regex_result)
+
+    # The LLM fallback (run back in the API process) needs the text
+    needs_fallback = parser._get_missing_fields(result) or parser._fields_below_threshold(result)
+    return {
+        "issuer": issuer,
+        "issuer_confidence": issuer_confidence,
+        "result": result,
+        "errors": errors,
+        "text": text if needs_fallback else None,
+        "timings": timer.timings,
+    }
+
+
+class ParsePipeline:
+    """
+    Runs the parse pipeline off the event loop.
+
+    CPU-bound stages go to a process pool of ``WORKER_PROCESSES`` workers
+    (0 runs them in a thread pool instead, handy for tests and dev); the LLM
+    fallback is awaited as async I/O on the event loop.
+    """
+
+    def __init__(self, processes: int = Config.WORKER_PROCESSES):
+        self.processes = processes
+        self._cpu_executor: Optional[Executor] = None
+        # Statements submitted to the CPU executor and not finished yet
+        self.pending = 0
+
+    def start(self):
+        if self._cpu_executor is not None:
+            return
+        self._cpu_executor = self._new_cpu_executor()
+        logger.info("pipeline_started", processes=self.processes)
+        if Config.MAX_REQUEST_MEMORY_MB and not self.memory_limit_mb:
+            logger.warning("memory_limit_disabled", reason="thread executor",
+                           max_request_memory_mb=Config.MAX_REQUEST_MEMORY_MB)
+
+    @property
+    def memory_limit_mb(self) -> float:
+        """
+        MAX_REQUEST_MEMORY_MB in process pool workers, each parsing one
+        statement at a time; 0 (off) in threads, which share one RSS
+        """
+        return Config.MAX_REQUEST_MEMORY_MB if self.processes > 0 else 0.0
+
+    @property
+    def workers(self) -> int:
+        if self._cpu_executor is None:
+            return 0
+        return self._cpu_executor._max_workers
+
+    def stats(self) -> Dict:
+        """Pending jobs, and how many of them wait for a free worker"""
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.workers),
+        }
+
+    def _new_cpu_executor(self) -> Executor:
+        if self.processes <= 0:
+            return ThreadPoolExecutor(thread_name_prefix="parse")
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+
+    async def warmup(self):
+        """
+        Warm this process and the pool workers (see ``warmup``) so the first
+        requests don't pay for imports and parser construction.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        # Concurrent submits make the pool spawn every worker
+        jobs = [loop.run_in_executor(self._cpu_executor, warmup)
+                for _ in range(max(self.workers, 1))]
+        await asyncio.gather(loop.run_in_executor(None, warmup), *jobs)
+
+    def shutdown(self):
+        if self._cpu_executor is not None:
+            self._cpu_executor.shutdown(wait=True, cancel_futures=True)
+        self._cpu_executor = None
+
+    async def run(self, source: Union[str, bytes],
+                  timer: Optional[StageTimer] = None,
+                  llm_budget=None) -> "StatementData":
+        """
+        Parse one statement from a file path or raw PDF bytes;
+        raises PipelineError for unparseable input. Stage timings are
+        added to ``timer`` and recorded in the metrics; an LLM fallback
+        call is drawn from ``llm_budget`` (an ``LLMBudget``) when given.
+        """
+        self.start()
+        timer = timer or StageTimer()
+        loop = asyncio.get_running_loop()
+        cpu_executor = self._cpu_executor
+
+        self.pending += 1
+        try:
+            extracted = await loop.run_in_executor(
+                cpu_executor, extract_statement, source, time.time(),
+                profiler.choose_mode(), self.memory_limit_mb
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. a native crash on a malformed PDF); replace
+            # the pool once so later requests are unaffected.
+            if self._cpu_executor is cpu_executor:
+                logger.error("worker_pool_broken")
+                self._cpu_executor = self._new_cpu_executor()
+                cpu_executor.shutdown(wait=False, cancel_futures=True)
+            raise PipelineError("PDF processing worker crashed")
+        finally:
+            self.pending -= 1
+
+        issuer = extracted["issuer"]
+        parser = get_parser(issuer)
+        result, errors = extracted["result"], extracted["errors"]
+        stage_timer = StageTimer()
+        stage_timer.merge(extracted["timings"])
+
+        fallback_used = False
+        if extracted["text"] is not None:
+            with stage_timer.span("llm"):
+                fallback_used = await parser.apply_llm_fallback_async(
+                    extracted["text"], result, errors, llm_budget
+                )
+
+        with stage_timer.span("validation"):
+            statement = parser._build_statement_data(result, errors, fallback_used)
+
+        timer.merge(stage_timer.timings)
+        metrics.record_statement(issuer, stage_timer.timings, statement)
+        return statement
@@ -0,0 +1,144 @@
+import cProfile
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+import structlog
+
+from app.config import Config
+
+logger = structlog.get_logger()
+
+# Profiling modes handed to the pool worker with each statement
+CPROFILE = "cprofile"  # deterministic, every call (1 in PROFILE_SAMPLE_RATE requests)
+SAMPLE = "sample"      # stack sampling, kept only if slower than PROFILE_SLOW_MS
+
+_request_counter = itertools.count(1)
+
+
+def choose_mode(sample_rate: int = None, slow_ms: float = None) -> Optional[str]:
+    """
+    Profiling mode for the next request (called in the API process, so the
+    1-in-N count is shared by all pool workers)
+    """
+    sample_rate = Config.PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    slow_ms = Config.PROFILE_SLOW_MS if slow_ms is None else slow_ms
+    if sample_rate > 0 and next(_request_counter) % sample_rate == 0:
+        return CPROFILE
+    if slow_ms > 0:
+        return SAMPLE
+    return None
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every ``interval`` seconds from a
+    background thread and counts collapsed stacks (flamegraph input).
+    Much cheaper than cProfile, so it can run on every request.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_filename(issuer: Optional[str], pages: int, timings: Dict[str, float],
+                     extension: str) -> str:
+    """e.g. 20261017T101500-123456_HDFC_30p_total812_text_extraction512_regex3.pstats"""
+    stamp = time.strftime("%Y%m%dT%H%M%S") + f"-{time.time_ns() // 1000 % 1_000_000:06d}"
+    parts = [stamp, issuer or "unknown", f"{pages}p", f"total{sum(timings.values()):.0f}"]
+    parts += [f"{stage}{elapsed:.0f}" for stage, elapsed in timings.items()]
+    return "_".join(parts) + extension
+
+
+class RequestProfiler:
+    """
+    Wraps one statement's CPU work (``with profiler: ...``), then
+    ``finish()`` writes the profile to PROFILE_DIR: a ``.pstats`` file in
+    cProfile mode, collapsed stacks (``.folded``) in sample mode when the
+    work took longer than PROFILE_SLOW_MS. No-op when ``mode`` is None.
+    """
+
+    def __init__(self, mode: Optional[str], directory: str = None,
+                 slow_ms: float = None, interval_ms: float = None):
+        self.mode = mode
+        self.directory = directory or Config.PROFILE_DIR
+        self.slow_ms = Config.PROFILE_SLOW_MS if slow_ms is None else slow_ms
+        interval_ms = Config.PROFILE_INTERVAL_MS if interval_ms is None else interval_ms
+        self.interval = interval_ms / 1000
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+        self.elapsed_ms = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        if self.mode == CPROFILE:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == SAMPLE:
+            self._sampler = StackSampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def finish(self, issuer: Optional[str], pages: int,
+               timings: Dict[str, float]) -> Optional[str]:
+        """
+        Write the profile if this request is kept; returns its path.
+        A profile that can't be written (unwritable PROFILE_DIR, full disk)
+        is logged and dropped, never failing the request it describes.
+        """
+        try:
+            if self._profile is not None:
+                path = self._path(issuer, pages, timings, ".pstats")
+                self._profile.dump_stats(path)
+            elif self._sampler is not None and self.elapsed_ms >= self.slow_ms and self._sampler.stacks:
+                path = self._path(issuer, pages, timings, ".folded")
+                with open(path, "w") as f:
+                    f.write(self._sampler.collapsed())
+            else:
+                return None
+        except OSError as e:
+            logger.warning("profile_write_failed", directory=self.directory, error=str(e))
+            return None
+        logger.info("profile_written", path=path, mode=self.mode, elapsed_ms=self.elapsed_ms)
+        return path
+
+    def _path(self, issuer, pages, timings, extension) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, profile_filename(issuer, pages, timings, extension))
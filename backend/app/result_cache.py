@@ -0,0 +1,93 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+import structlog
+
+from app.cache import PersistentLRUCache
+from app.config import Config
+from app.pattern_registry import get_pattern_registry
+from app.schemas import StatementData
+
+logger = structlog.get_logger()
+
+APP_DIR = Path(__file__).resolve().parent
+
+# Code that decides what a PDF parses to; editing any of these files (or a
+# pattern spec, see PatternRegistry.fingerprint, or the text engine,
+# streaming and confidence threshold settings) changes the version tag and so invalidates
+# previously cached results.
+VERSIONED_SOURCES = ["issuer_detector.py", "validators.py", "pdf_loader.py",
+                     "llm_extractor.py", "pattern_registry.py", "pipeline.py",
+                     "parsers"]
+
+
+def parser_version() -> str:
+    """Short fingerprint of the parser code"""
+    digest = hashlib.sha256()
+    for name in VERSIONED_SOURCES:
+        path = APP_DIR / name
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            digest.update(file.relative_to(APP_DIR).as_posix().encode())
+            digest.update(file.read_bytes())
+    # Settings that change results: the text engines can differ in reading
+    # order, streaming decides how many pages get parsed, the thresholds
+    # decide which fields the LLM re-extracts, and whether and which LLM
+    # answers them
+    digest.update(repr((
+        Config.PDF_TEXT_ENGINE, sorted(Config.PDF_TEXT_ENGINE_BY_ISSUER.items()),
+        Config.STREAMING_EXTRACTION, Config.STREAM_PAGE_BUDGET,
+        Config.CONFIDENCE_THRESHOLD, sorted(Config.CONFIDENCE_THRESHOLD_BY_ISSUER.items()),
+        Config.USE_LLM_FALLBACK, Config.DEFAULT_MODEL,
+    )).encode())
+    return digest.hexdigest()[:12]
+
+
+class ResultCache:
+    """
+    Content-addressed StatementData cache: keyed by the SHA-256 of the PDF
+    bytes plus the parser version, so re-uploads of the same statement skip
+    extraction and any LLM fallback.
+    """
+
+    def __init__(self, path: Optional[str] = Config.RESULT_CACHE_PATH,
+                 max_entries: int = Config.RESULT_CACHE_SIZE,
+                 version: Optional[str] = None):
+        self._version = version
+        self._code_version = parser_version()
+        self._store = PersistentLRUCache(path, max_entries=max_entries,
+                                         table="statement_results")
+
+    @property
+    def version(self) -> str:
+        """Parser code + pattern spec version; follows pattern hot reloads"""
+        if self._version:
+            return self._version
+        return f"{self._code_version}.{get_pattern_registry().fingerprint()}"
+
+    def key(self, content: bytes) -> str:
+        return f"{hashlib.sha256(content).hexdigest()}:{self.version}"
+
+    def get(self, content: bytes) -> Optional[StatementData]:
+        value = self._store.get(self.key(content))
+        if value is None:
+            return None
+        try:
+            return StatementData.model_validate_json(value)
+        except ValueError as e:
+            logger.warning("result_cache_corrupt_entry", error=str(e))
+            return None
+
+    def put(self, content: bytes, statement: StatementData):
+        # Errors may be transient (e.g. a failed LLM call, or a fallback
+        # skipped because the request's LLM budget ran out); don't pin them
+        if statement.parsing_errors:
+            logger.info("result_cache_skipped", errors=len(statement.parsing_errors))
+            return
+        self._store.set(self.key(content), statement.model_dump_json())
+
+    def stats(self) -> Dict:
+        return {"version": self.version, **self._store.stats()}
+
+    def close(self):
+        self._store.close()
@@ -1,4 +1,4 @@
-from typing import Optional, List, Literal
+from typing import Dict, Optional, List, Literal
 from pydantic import BaseModel, Field
 from datetime import date
 
@@ -27,4 +27,8 @@ class ParserResponse(BaseModel):
     success: bool
     data: Optional[StatementData] = None
     errors: List[str] = []
-    processing_time_ms: float
\ No newline at end of file
+    processing_time_ms: float
+    filename: Optional[str] = None
+    cached: bool = False
+    # Per-stage milliseconds, only when requested with ?timings=true
+    timings: Optional[Dict[str, float]] = None
\ No newline at end of file
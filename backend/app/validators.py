@@ -34,7 +34,7 @@ class FieldValidator:
         # Common date formats
         date_patterns = [
             r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',
-            r'\d{1,2}\s+[A-Za-z]{3,9}\s+\d{2,4}',
+            r'\d{1,2}[\s/-][A-Za-z]{3,9}[\s/-]\d{2,4}',
             r'[A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4}'
         ]
         
@@ -68,7 +68,7 @@ class FieldValidator:
         if not value:
             return False, 0.0
         
-        known_issuers = ["HDFC", "ICICI", "SBI", "AXIS", "AMEX", 
+        known_issuers = ["HDFC", "ICICI", "SBI", "AXIS", "AMEX", "American Express",
                         "hdfc", "icici", "sbi", "axis", "amex"]
         
         for issuer in known_issuers:
@@ -0,0 +1 @@
+"""Per-stage micro-benchmarks (run with ``python -m benchmarks.run``)"""
@@ -0,0 +1,54 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results/latest.json
+
+Exits with status 1 when any case regressed beyond ``--threshold``.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+from benchmarks.harness import compare
+
+
+def load_results(path: str) -> Dict[str, Dict]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def print_report(rows: List[Dict], metric: str):
+    print(f"{'case':<50} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    print("-" * 90)
+    for row in rows:
+        if "ratio" not in row:
+            print(f"{row['name']:<50} {'':>10} {'':>10} {'':>8}  {row['status']}")
+            continue
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%"
+        print(f"{row['name']:<50} {row['baseline']:>10.4f} {row['current']:>10.4f} "
+              f"{change:>8}  {row['status']}")
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    print("-" * 90)
+    print(f"{regressions} regression(s) on {metric}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown that counts as a regression (default 0.2)")
+    parser.add_argument("--metric", default="p50_ms",
+                        choices=["min_ms", "mean_ms", "p50_ms", "p90_ms", "p99_ms"])
+    args = parser.parse_args(argv)
+
+    rows = compare(load_results(args.baseline), load_results(args.current),
+                   threshold=args.threshold, metric=args.metric)
+    print_report(rows, args.metric)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Compare the PDF text engines on a synthetic corpus: extraction time and
+whether the regex stage parses the same fields from either engine's text.
+
+    python -m benchmarks.engines                      # fresh 50-PDF corpus
+    python -m benchmarks.engines corpus/              # a generate_corpus directory
+
+Run from the ``backend`` directory. Exits 1 if any field differs.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import structlog
+
+from app.issuer_detector import IssuerDetector
+from app.pdf_loader import TEXT_ENGINES, PDFLoader
+from app.pipeline import get_parser
+from benchmarks.harness import percentile
+from tests.pdf_corpus import generate_corpus
+
+
+def parse_fields(pdf: bytes, engine: str) -> Tuple[Dict[str, str], float]:
+    """Regex-stage field values from ``engine``'s text, and the extraction time in ms"""
+    with PDFLoader.load(pdf, text_engine=engine) as document:
+        start = time.perf_counter()
+        text = document.text
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    issuer, _ = IssuerDetector.detect(text)
+    parser = get_parser(issuer) if issuer else None
+    result = parser.extract_with_regex(text) if parser else {}
+    fields = {field: value["value"] for field, value in result.items()}
+    return {"detected_issuer": issuer, **fields}, elapsed_ms
+
+
+def compare_engines(directory: str) -> Tuple[Dict[str, List[float]], List[Dict]]:
+    """Per-engine extraction times and the files whose fields differ"""
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    times: Dict[str, List[float]] = {engine: [] for engine in TEXT_ENGINES}
+    mismatches = []
+    for entry in manifest:
+        with open(os.path.join(directory, entry["file"]), "rb") as f:
+            pdf = f.read()
+        parsed = {}
+        for engine in TEXT_ENGINES:
+            parsed[engine], elapsed_ms = parse_fields(pdf, engine)
+            times[engine].append(elapsed_ms)
+        if len({json.dumps(fields, sort_keys=True) for fields in parsed.values()}) > 1:
+            mismatches.append({"file": entry["file"], **parsed})
+    return times, mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", nargs="?",
+                        help="corpus directory with manifest.json (default: generate one)")
+    parser.add_argument("--count", type=int, default=50, help="size of the generated corpus")
+    args = parser.parse_args(argv)
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.directory
+        if directory is None:
+            directory = scratch
+            generate_corpus(directory, args.count, pages=(1, 10), rows=(0, 400),
+                            tables=(0, 2), noise=0.1, seed=1)
+        times, mismatches = compare_engines(directory)
+
+    for engine, values in times.items():
+        values = sorted(values)
+        print(f"{engine:<12} total {sum(values):>9.1f} ms  p50 {percentile(values, 50):>8.2f} ms  "
+              f"p99 {percentile(values, 99):>8.2f} ms  ({len(values)} files)")
+    for mismatch in mismatches:
+        print(f"MISMATCH {json.dumps(mismatch)}")
+    print(f"\n{len(mismatches)} of {len(next(iter(times.values())))} files parse differently")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Local stand-in for the Groq (OpenAI-compatible) chat completions API, for
+load-testing the LLM fallback path without the real service.
+
+Answers the extractor's prompts, single- and multi-document, with plausible
+JSON for the requested fields. Latency follows a configurable distribution,
+and a share of calls can fail, hang past the client timeout or return
+malformed JSON:
+
+    python -m benchmarks.fake_groq --port 8900 --latency lognormal:400,0.5 \\
+        --error-rate 0.02 --rate-limit-rate 0.02 --timeout-rate 0.01 --malformed-rate 0.02
+
+    GROQ_BASE_URL=http://127.0.0.1:8900 GROQ_API_KEY=fake uvicorn main:app
+
+``GET /stats`` reports calls by outcome and peak concurrency; ``POST /reset``
+clears them between runs. Run from the ``backend`` directory.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+ISSUER_NAMES = ["HDFC Bank", "ICICI Bank", "SBI Card", "Axis Bank", "American Express"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Outcomes, in the order their rates are applied
+OUTCOMES = ("error", "rate_limit", "timeout", "malformed")
+
+_FIELD = re.compile(r'"(issuer|card_last_4|statement_period|due_date|total_amount_due)":')
+_DOCUMENT = re.compile(r'"(doc\d+)": \{([^}]*)\}')
+_ISSUER_HINT = re.compile(r"[Ii]ssuer is likely ([^)\n]+)")
+
+
+class LatencyModel:
+    """
+    Response delay from a spec string, in milliseconds:
+    ``fixed:MS``, ``uniform:LOW-HIGH``, ``normal:MEAN,STDDEV`` or
+    ``lognormal:MEDIAN,SIGMA`` (long-tailed, closest to a real API)
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in re.split(r"[,-]", params) if value]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution {kind!r}")
+        if len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"Bad parameters for {kind} latency: {params!r}")
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds"""
+        if self.kind == "fixed":
+            ms = self.values[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(*self.values)
+        elif self.kind == "normal":
+            ms = rng.gauss(*self.values)
+        else:
+            median, sigma = self.values
+            ms = median * rng.lognormvariate(0, sigma)
+        return max(0.0, ms) / 1000
+
+
+def _plausible_value(field: str, issuer: Optional[str], rng: random.Random) -> str:
+    year = 2024
+    month = rng.randrange(12)
+    if field == "issuer":
+        return issuer or rng.choice(ISSUER_NAMES)
+    if field == "card_last_4":
+        return f"{rng.randrange(10000):04d}"
+    if field == "statement_period":
+        return f"01-{MONTHS[month]}-{year} to 28-{MONTHS[month]}-{year}"
+    if field == "due_date":
+        return f"{rng.randint(1, 28):02d}-{MONTHS[month]}-{year}"
+    return f"{rng.randint(100, 99999)}.{rng.randrange(100):02d}"
+
+
+def answer(prompt: str) -> Dict:
+    """
+    The JSON an extractor prompt asks for: ``{field: value}``, or
+    ``{doc_id: {field: value}}`` for a multi-document prompt. Values are
+    seeded by the prompt, so the same prompt always gets the same answer.
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode()).digest())
+    hints = _ISSUER_HINT.findall(prompt)
+    documents = _DOCUMENT.findall(prompt)
+    if documents:
+        doc_hints = dict(re.findall(r"=== (doc\d+) \(issuer is likely ([^)]+)\)", prompt))
+        return {doc_id: {field: _plausible_value(field, doc_hints.get(doc_id), rng)
+                         for field in _FIELD.findall(fields)}
+                for doc_id, fields in documents}
+    issuer = hints[0].strip() if hints else None
+    return {field: _plausible_value(field, issuer, rng) for field in _FIELD.findall(prompt)}
+
+
+class FakeGroq:
+    """
+    Behaviour and counters of one stand-in server. Each call draws its
+    outcome: ``error`` (500), ``rate_limit`` (429 with Retry-After),
+    ``timeout`` (hangs for ``hang_seconds``, past any sane client timeout),
+    ``malformed`` (200 with broken JSON content), otherwise ``ok``.
+    """
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, timeout_rate: float = 0.0,
+                 malformed_rate: float = 0.0, hang_seconds: float = 300.0,
+                 seed: Optional[int] = None):
+        self.latency = LatencyModel(latency)
+        self.rates = dict(zip(OUTCOMES, (error_rate, rate_limit_rate, timeout_rate, malformed_rate)))
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.outcomes: Dict[str, int] = {outcome: 0 for outcome in ("ok", *OUTCOMES)}
+        self.latencies: List[float] = []
+
+    def stats(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "outcomes": dict(self.outcomes),
+            "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else 0.0,
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "config": {"latency": self.latency.spec, **{f"{k}_rate": v for k, v in self.rates.items()}},
+        }
+
+    def draw_outcome(self) -> str:
+        roll = self.rng.random()
+        for outcome, rate in self.rates.items():
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return "ok"
+
+    async def complete(self, body: Dict) -> Tuple[int, Dict, Dict[str, str]]:
+        """Status, JSON body and headers for one chat completion request"""
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            outcome = self.draw_outcome()
+            self.outcomes[outcome] += 1
+            delay = self.latency.sample(self.rng)
+            self.latencies.append(delay)
+            await asyncio.sleep(self.hang_seconds if outcome == "timeout" else delay)
+
+            if outcome == "error":
+                return 500, _error("Internal server error", "internal_server_error"), {}
+            if outcome == "rate_limit":
+                return 429, _error("Rate limit reached", "rate_limit_exceeded"), {"retry-after": "1"}
+
+            prompt = body["messages"][-1]["content"]
+            content = json.dumps(answer(prompt))
+            if outcome == "malformed":
+                content = "Here is the JSON you asked for:\n" + content[: len(content) // 2]
+            return 200, _completion(body.get("model", ""), prompt, content), {}
+        finally:
+            self.in_flight -= 1
+
+
+def _error(message: str, code: str) -> Dict:
+    return {"error": {"message": message, "type": code, "code": code}}
+
+
+def _completion(model: str, prompt: str, content: str) -> Dict:
+    prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+    return {
+        "id": f"chatcmpl-{hashlib.md5(prompt.encode()).hexdigest()[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+            "logprobs": None,
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def create_app(fake: Optional[FakeGroq] = None) -> FastAPI:
+    fake = fake or FakeGroq()
+    app = FastAPI(title="Fake Groq")
+    app.state.fake = fake
+
+    # The Groq SDK calls /openai/v1/...; plain OpenAI clients call /v1/...
+    @app.post("/openai/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        status, body, headers = await fake.complete(await request.json())
+        return JSONResponse(body, status_code=status, headers=headers)
+
+    @app.get("/stats")
+    async def stats():
+        return fake.stats()
+
+    @app.post("/reset")
+    async def reset():
+        fake.reset()
+        return fake.stats()
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Groq-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="lognormal:400,0.5",
+                        help="fixed:MS, uniform:LOW-HIGH, normal:MEAN,STDDEV or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="share of calls that hang for --hang-seconds")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="share of 200 responses with broken JSON content")
+    parser.add_argument("--hang-seconds", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    fake = FakeGroq(latency=args.latency, error_rate=args.error_rate,
+                    rate_limit_rate=args.rate_limit_rate, timeout_rate=args.timeout_rate,
+                    malformed_rate=args.malformed_rate, hang_seconds=args.hang_seconds,
+                    seed=args.seed)
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
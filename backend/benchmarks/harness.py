@@ -0,0 +1,76 @@
+import gc
+import time
+from typing import Callable, Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def measure(fn: Callable[[], object], warmup: int = 3, repeat: int = 50,
+            min_runs: int = 5, max_seconds: float = 5.0) -> Dict[str, float]:
+    """
+    Time ``fn`` in isolation: ``warmup`` untimed calls, then up to ``repeat``
+    timed ones (stopping early after ``max_seconds`` once ``min_runs`` are
+    in, so slow stages don't dominate the suite). GC is paused while timing.
+    Returns milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+            if len(samples) >= min_runs and time.perf_counter() - started > max_seconds:
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0],
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p90_ms": percentile(samples, 90),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": samples[-1],
+    }
+
+
+def compare(baseline: Dict[str, Dict], current: Dict[str, Dict], threshold: float = 0.2,
+            metric: str = "p50_ms", min_delta_ms: float = 0.005) -> List[Dict]:
+    """
+    Compare two result sets case by case. A case regresses when ``metric``
+    grew by more than ``threshold`` (0.2 = 20%) and by at least
+    ``min_delta_ms``, which keeps microsecond-level jitter out of the report.
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            rows.append({"name": name, "status": "new" if name in current else "missing"})
+            continue
+        before, after = baseline[name][metric], current[name][metric]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold and after - before >= min_delta_ms:
+            status = "regression"
+        elif ratio < 1 - threshold and before - after >= min_delta_ms:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "baseline": before,
+                     "current": after, "ratio": ratio})
+    return rows
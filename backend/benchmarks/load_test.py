@@ -0,0 +1,395 @@
+"""
+End-to-end HTTP load test of ``POST /parse-statement`` on a local uvicorn.
+
+Starts the API (and optionally the ``benchmarks.fake_groq`` stand-in for
+the LLM fallback), renders a synthetic corpus with the requested issuer
+mix and sizes, then drives the server at each concurrency level in turn.
+Every level reports throughput, p50/p95/p99 latency and error rate, plus
+CPU and RSS of the server and its pool workers sampled over the run:
+
+    python -m benchmarks.load_test                                   # concurrency 1,4,16
+    python -m benchmarks.load_test --concurrency 8 --duration 60 --issuers HDFC=3,AMEX=1 --pages 1-20
+    python -m benchmarks.load_test --corpus corpus/ --fake-groq lognormal:400,0.5
+    python -m benchmarks.load_test --compare benchmarks/results/load-baseline.json
+
+Results are saved as JSON (``--output``); ``--compare`` flags levels whose
+latency (``--metric``, p99 by default) regressed against a saved run and
+exits 1. Caches are off on the spawned server so every request does the
+full parse. Run from the ``backend`` directory; CPU/RSS sampling reads
+/proc (Linux).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from benchmarks.compare import load_results, print_report
+from benchmarks.harness import compare, percentile
+from tests.pdf_corpus import ISSUERS, generate_corpus, int_or_range
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "load-latest.json")
+
+
+def parse_mix(spec: str) -> List[str]:
+    """"HDFC=3,AMEX=1" -> ["HDFC", "HDFC", "HDFC", "AMEX"] (a bare code weighs 1)"""
+    issuers = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        code, _, weight = item.partition("=")
+        if code not in ISSUERS:
+            raise ValueError(f"Unknown issuer {code}; expected one of {ISSUERS}")
+        issuers += [code] * int(weight or 1)
+    return issuers
+
+
+def load_corpus(directory: str) -> List[Tuple[Dict, bytes]]:
+    """Manifest entries of a ``generate_corpus`` directory with their PDF bytes"""
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    corpus = []
+    for entry in manifest:
+        with open(os.path.join(directory, entry["file"]), "rb") as f:
+            corpus.append((entry, f.read()))
+    return corpus
+
+
+def _process_tree(root: int) -> List[int]:
+    """``root`` and all its descendants (pool workers, the resource tracker)"""
+    parents: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(name))
+    tree, queue = [], [root]
+    while queue:
+        pid = queue.pop()
+        tree.append(pid)
+        queue.extend(parents.get(pid, []))
+    return tree
+
+
+def _cpu_seconds_and_rss(pid: int) -> Optional[Tuple[float, int]]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return cpu, rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class ResourceSampler:
+    """
+    Samples CPU (% of one core) and RSS of a process tree every
+    ``interval`` seconds from a background thread, per process and in total.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+
+    def __enter__(self):
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        started = last_time = time.perf_counter()
+        last_cpu: Dict[int, float] = {}
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            processes = []
+            for pid in _process_tree(self.pid):
+                usage = _cpu_seconds_and_rss(pid)
+                if usage is None:
+                    continue
+                cpu, rss = usage
+                cpu_percent = (cpu - last_cpu.get(pid, cpu)) / (now - last_time) * 100
+                last_cpu[pid] = cpu
+                processes.append({"pid": pid, "cpu_percent": round(cpu_percent, 1),
+                                  "rss_mb": round(rss / 2 ** 20, 1)})
+            last_time = now
+            self.samples.append({
+                "t": round(now - started, 2),
+                "cpu_percent": round(sum(p["cpu_percent"] for p in processes), 1),
+                "rss_mb": round(sum(p["rss_mb"] for p in processes), 1),
+                "processes": processes,
+            })
+
+    def summary(self) -> Dict:
+        if not self.samples:
+            return {}
+        return {
+            "cpu_percent_mean": round(sum(s["cpu_percent"] for s in self.samples) / len(self.samples), 1),
+            "cpu_percent_max": max(s["cpu_percent"] for s in self.samples),
+            "rss_mb_max": max(s["rss_mb"] for s in self.samples),
+        }
+
+
+async def run_level(client: httpx.AsyncClient, corpus: Sequence[Tuple[Dict, bytes]],
+                    concurrency: int, duration: float = 30.0,
+                    requests: Optional[int] = None, seed: int = 0) -> Tuple[List[Dict], float]:
+    """
+    Closed-loop load: ``concurrency`` clients each send a random corpus file,
+    wait for the answer and send the next, until ``requests`` have been sent
+    or ``duration`` seconds have passed. Returns one record per request and
+    the elapsed seconds.
+    """
+    rng = random.Random(seed)
+    records: List[Dict] = []
+    deadline = time.perf_counter() + duration
+    sent = 0
+
+    async def client_loop():
+        nonlocal sent
+        while time.perf_counter() < deadline and (requests is None or sent < requests):
+            sent += 1
+            entry, pdf = corpus[rng.randrange(len(corpus))]
+            record = {"issuer": entry.get("issuer"), "pages": entry.get("pages"),
+                      "bytes": len(pdf)}
+            started = time.perf_counter()
+            try:
+                response = await client.post("/parse-statement",
+                                             files={"file": (entry["file"], pdf, "application/pdf")})
+                record["status"] = response.status_code
+                record["ok"] = response.status_code == 200 and response.json().get("success", False)
+            except httpx.HTTPError as e:
+                record.update(status=None, ok=False, error=type(e).__name__)
+            record["latency_ms"] = (time.perf_counter() - started) * 1000
+            records.append(record)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return records, time.perf_counter() - started
+
+
+def summarize(records: Sequence[Dict], elapsed: float) -> Dict:
+    """Throughput, latency percentiles and error rate of one level, overall and per issuer"""
+    def latency_stats(subset):
+        latencies = sorted(r["latency_ms"] for r in subset)
+        errors = sum(1 for r in subset if not r["ok"])
+        return {
+            "requests": len(subset),
+            "errors": errors,
+            "error_rate": errors / len(subset) if subset else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+        }
+
+    statuses: Dict[str, int] = {}
+    for record in records:
+        key = str(record["status"] or record.get("error"))
+        statuses[key] = statuses.get(key, 0) + 1
+    issuers = sorted({r["issuer"] for r in records if r["issuer"]})
+    return {
+        **latency_stats(records),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(records) / elapsed if elapsed else 0.0,
+        "statuses": statuses,
+        "by_issuer": {issuer: latency_stats([r for r in records if r["issuer"] == issuer])
+                      for issuer in issuers},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(args: List[str], env: Dict[str, str], ready_url: str, log=subprocess.DEVNULL,
+           timeout: float = 60.0) -> subprocess.Popen:
+    """Start a server process (output to ``log``) and wait until ``ready_url`` answers"""
+    process = subprocess.Popen([sys.executable, *args], env={**os.environ, **env},
+                               stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(args)} exited with {process.returncode}")
+        try:
+            httpx.get(ready_url, timeout=1.0)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{' '.join(args)} not ready after {timeout}s")
+
+
+def _stop(process: Optional[subprocess.Popen]):
+    if process is None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def _print_level(name: str, stats: Dict):
+    resources = stats.get("resources", {})
+    print(f"{name:<6} {stats['requests']:>6} req  {stats['throughput_rps']:>7.2f} req/s  "
+          f"p50 {stats['p50_ms']:>8.1f}  p95 {stats['p95_ms']:>8.1f}  p99 {stats['p99_ms']:>8.1f} ms  "
+          f"errors {stats['error_rate'] * 100:>5.1f}%  "
+          f"cpu {resources.get('cpu_percent_mean', 0):>5.0f}%  "
+          f"rss {resources.get('rss_mb_max', 0):>6.0f} MB")
+
+
+async def _drive(url: str, corpus, levels: Sequence[int], args, server_pid: Optional[int]) -> Dict:
+    results = {}
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup:
+            await run_level(client, corpus, 1, requests=args.warmup, seed=args.seed)
+        for concurrency in levels:
+            sampler = ResourceSampler(server_pid, args.sample_interval) if server_pid else None
+            with sampler or contextlib.nullcontext():
+                records, elapsed = await run_level(client, corpus, concurrency, args.duration,
+                                                   args.requests, seed=args.seed + concurrency)
+            stats = summarize(records, elapsed)
+            stats["concurrency"] = concurrency
+            if sampler:
+                stats["resources"] = sampler.summary()
+                stats["resource_samples"] = sampler.samples
+            results[f"c{concurrency}"] = stats
+            _print_level(f"c{concurrency}", stats)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--pid", type=int, help="with --url: the server process to sample CPU/RSS of")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated levels")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per level")
+    parser.add_argument("--requests", type=int, help="stop a level after this many requests")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests before the first level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request client timeout")
+    parser.add_argument("--corpus", help="generate_corpus directory (default: generate one)")
+    parser.add_argument("--count", type=int, default=50, help="files in a generated corpus")
+    parser.add_argument("--issuers", default=",".join(ISSUERS),
+                        help="issuer mix with optional weights, e.g. HDFC=3,AMEX=1")
+    parser.add_argument("--pages", type=int_or_range, default=(1, 10), help="N or LOW-HIGH")
+    parser.add_argument("--rows", type=int_or_range, default=(0, 500), help="N or LOW-HIGH")
+    parser.add_argument("--tables", type=int_or_range, default=0, help="N or LOW-HIGH")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="WORKER_PROCESSES of the spawned server")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the spawned server (repeatable)")
+    parser.add_argument("--fake-groq", metavar="LATENCY",
+                        help="start benchmarks.fake_groq with this latency spec for the LLM fallback")
+    parser.add_argument("--fake-groq-args", default="",
+                        help='extra fake_groq flags, e.g. "--error-rate 0.02 --timeout-rate 0.01"')
+    parser.add_argument("--server-log", help="write the spawned servers' output here (default: discard)")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="CPU/RSS sampling period (s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved run afterwards")
+    parser.add_argument("--metric", default="p99_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    server_env = {
+        "WORKER_PROCESSES": str(args.workers),
+        "RESULT_CACHE_ENABLED": "false",
+        "LLM_CACHE_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    server_env.update(item.split("=", 1) for item in args.server_env)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.corpus:
+            corpus_params = {"corpus": args.corpus}
+            directory = args.corpus
+        else:
+            corpus_params = {"count": args.count, "issuers": args.issuers, "pages": args.pages,
+                             "rows": args.rows, "tables": args.tables, "seed": args.seed}
+            directory = scratch
+            generate_corpus(directory, args.count, issuers=parse_mix(args.issuers),
+                            pages=args.pages, rows=args.rows, tables=args.tables, seed=args.seed)
+        corpus = load_corpus(directory)
+        print(f"Corpus: {len(corpus)} PDFs, {sum(len(pdf) for _, pdf in corpus) / 1e6:.1f} MB")
+
+        fake_groq = server = None
+        log = open(args.server_log, "ab") if args.server_log else subprocess.DEVNULL
+        try:
+            if args.fake_groq and not args.url:
+                port = _free_port()
+                fake_groq = _start(["-m", "benchmarks.fake_groq", "--port", str(port),
+                                    "--latency", args.fake_groq, *args.fake_groq_args.split()],
+                                   {}, f"http://127.0.0.1:{port}/stats", log)
+                server_env.update(GROQ_BASE_URL=f"http://127.0.0.1:{port}", GROQ_API_KEY="fake")
+            url = args.url
+            if not url:
+                port = _free_port()
+                url = f"http://127.0.0.1:{port}"
+                server = _start(["-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+                                 "--port", str(port), "--log-level", "warning"],
+                                server_env, f"{url}/health", log)
+            results = asyncio.run(_drive(url, corpus, levels, args, server.pid if server else args.pid))
+        finally:
+            _stop(server)
+            _stop(fake_groq)
+            if args.server_log:
+                log.close()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "url": args.url or "spawned",
+                "server_env": {} if args.url else server_env,
+                "fake_groq": args.fake_groq and f"{args.fake_groq} {args.fake_groq_args}".strip(),
+                "duration": args.duration,
+                "requests": args.requests,
+                **corpus_params,
+            },
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+    print(f"\nSaved {len(results)} levels to {args.output}")
+
+    if args.compare:
+        print()
+        rows = compare(load_results(args.compare), results,
+                       threshold=args.threshold, metric=args.metric)
+        print_report(rows, args.metric)
+        return 1 if any(row["status"] == "regression" for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
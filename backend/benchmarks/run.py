@@ -0,0 +1,80 @@
+"""
+Run the per-stage micro-benchmarks and save the results as JSON.
+
+    python -m benchmarks.run                                  # all stages
+    python -m benchmarks.run --stage detector --stage parser
+    python -m benchmarks.run --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Run from the ``backend`` directory.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+import structlog
+
+from benchmarks.compare import load_results, print_report
+from benchmarks.harness import compare, measure
+from benchmarks.suite import STAGES, build_cases
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stage", action="append", choices=list(STAGES),
+                        help="stage to run (repeatable; default: all)")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="time budget per case once 5 runs are in")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a saved result file afterwards")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    # Per-call log lines would swamp the output (and the timings)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    results = {}
+    for name, fn in build_cases(args.stage):
+        if args.filter not in name:
+            continue
+        stats = measure(fn, warmup=args.warmup, repeat=args.repeat,
+                        max_seconds=args.max_seconds)
+        results[name] = stats
+        print(f"{name:<50} p50 {stats['p50_ms']:>9.4f} ms  p90 {stats['p90_ms']:>9.4f} ms  "
+              f"p99 {stats['p99_ms']:>9.4f} ms  ({stats['runs']} runs)")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "warmup": args.warmup,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.compare:
+        print()
+        rows = compare(load_results(args.compare), results, threshold=args.threshold)
+        print_report(rows, "p50_ms")
+        return 1 if any(row["status"] == "regression" for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark cases, one per pipeline stage, built from MockStatementGenerator.
+
+Every statement is benchmarked at several sizes: the bare mock statement,
+and the same statement followed by a long transaction listing, since that
+is what makes real statements slow.
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+from app.issuer_detector import IssuerDetector
+from app.parsers.amex_parser import AmexParser
+from app.parsers.axis_parser import AxisParser
+from app.parsers.hdfc_parser import HDFCParser
+from app.parsers.icici_parser import ICICIParser
+from app.parsers.sbi_parser import SBIParser
+from app.pdf_loader import TEXT_ENGINES, PDFLoader
+from app.validators import FieldValidator
+from tests.mock_statements import MockStatementGenerator
+
+# Extra transaction rows appended to the mock statement per size
+SIZES: Dict[str, int] = {"small": 0, "medium": 200, "large": 2000}
+# PDFs cost far more per row, so the loader uses smaller listings
+PDF_SIZES: Dict[str, int] = {"small": 0, "medium": 60, "large": 300}
+ROWS_PER_PAGE = 60
+
+PARSERS = [
+    (HDFCParser, MockStatementGenerator.generate_hdfc_statement),
+    (ICICIParser, MockStatementGenerator.generate_icici_statement),
+    (SBIParser, MockStatementGenerator.generate_sbi_statement),
+    (AxisParser, MockStatementGenerator.generate_axis_statement),
+    (AmexParser, MockStatementGenerator.generate_amex_statement),
+]
+
+VALIDATOR_INPUTS = {
+    "validate_card_last_4": ["1234", "XXXX XXXX XXXX 5678", "12", ""],
+    "validate_date": ["15-Dec-2024", "20/12/2024", "Dec 15, 2024", "soon"],
+    "validate_amount": ["45678.50", "₹1,234.00", "-5", "n/a"],
+    "validate_issuer": ["HDFC Bank", "American Express", "Unknown Bank", ""],
+}
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def transaction_rows(count: int) -> List[str]:
+    return [f"{1 + i % 28:02d}-Nov-24   Merchant purchase #{i:05d}       ₹{(i * 37) % 9000 + 10:,}.00"
+            for i in range(count)]
+
+
+def statement_text(generator: Callable[[], str], rows: int) -> str:
+    return generator() + "\n".join(transaction_rows(rows))
+
+
+def statement_pdf(generator: Callable[[], str], rows: int) -> bytes:
+    """Mock statement on page 1, transaction rows on the following pages"""
+    doc = fitz.open()
+    doc.new_page().insert_text((40, 40), generator(), fontsize=8)
+    lines = transaction_rows(rows)
+    for start in range(0, len(lines), ROWS_PER_PAGE):
+        page = doc.new_page()
+        page.insert_text((40, 40), "\n".join(lines[start:start + ROWS_PER_PAGE]), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _load_text(pdf: bytes, engine: str) -> str:
+    with PDFLoader.load(pdf, text_engine=engine) as document:
+        return document.text
+
+
+def _load_tables(pdf: bytes) -> list:
+    with PDFLoader.load(pdf) as document:
+        return document.tables
+
+
+def loader_cases() -> List[Case]:
+    cases = []
+    for size, rows in PDF_SIZES.items():
+        pdf = statement_pdf(MockStatementGenerator.generate_hdfc_statement, rows)
+        for engine in TEXT_ENGINES:
+            cases.append((f"loader.text.{engine}[{size}]",
+                          lambda pdf=pdf, engine=engine: _load_text(pdf, engine)))
+        cases.append((f"loader.tables[{size}]", lambda pdf=pdf: _load_tables(pdf)))
+    return cases
+
+
+def detector_cases() -> List[Case]:
+    cases = []
+    for size, rows in SIZES.items():
+        text = statement_text(MockStatementGenerator.generate_hdfc_statement, rows)
+        cases.append((f"detector.detect[{size}]", lambda text=text: IssuerDetector.detect(text)))
+        # No issuer anywhere: the worst case, every pattern scans everything
+        unknown = "\n".join(transaction_rows(rows or 10))
+        cases.append((f"detector.detect_unknown[{size}]",
+                      lambda text=unknown: IssuerDetector.detect(text)))
+    return cases
+
+
+def parser_cases() -> List[Case]:
+    cases = []
+    for parser_cls, generator in PARSERS:
+        parser = parser_cls()
+        for size, rows in SIZES.items():
+            text = statement_text(generator, rows)
+            cases.append((f"parser.{parser.ISSUER}.extract_with_regex[{size}]",
+                          lambda parser=parser, text=text: parser.extract_with_regex(text)))
+    return cases
+
+
+def build_statement_cases() -> List[Case]:
+    parser = HDFCParser()
+    result = parser.extract_with_regex(MockStatementGenerator.generate_hdfc_statement())
+    partial = {"issuer": result["issuer"]}
+    return [
+        ("parser.build_statement_data[complete]",
+         lambda: parser._build_statement_data(result, [], False)),
+        ("parser.build_statement_data[partial]",
+         lambda: parser._build_statement_data(partial, [], False)),
+    ]
+
+
+def validator_cases() -> List[Case]:
+    cases = []
+    for method_name, values in VALIDATOR_INPUTS.items():
+        method = getattr(FieldValidator, method_name)
+        cases.append((f"validators.{method_name}",
+                       lambda method=method, values=values: [method(v) for v in values]))
+    return cases
+
+
+STAGES: Dict[str, Callable[[], List[Case]]] = {
+    "loader": loader_cases,
+    "detector": detector_cases,
+    "parser": parser_cases,
+    "build": build_statement_cases,
+    "validators": validator_cases,
+}
+
+
+def build_cases(stages: List[str] = None) -> List[Case]:
+    cases = []
+    for stage in stages or STAGES:
+        cases.extend(STAGES[stage]())
+    return cases
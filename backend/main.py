@@ -1,19 +1,29 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+import sys
+
+if __name__ == "__main__":
+    # CLI usage: python main.py [--profile] <pdf_path> (see app/cli.py);
+    # returns before the web stack below is imported
+    from app.cli import main as cli_main
+    sys.exit(cli_main())
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-import tempfile
+from starlette.datastructures import UploadFile as FormFile
 import time
-from typing import Optional
+from typing import Optional, Tuple, Union
 import structlog
 
-from app.pdf_loader import PDFLoader
-from app.issuer_detector import IssuerDetector
-from app.parsers.hdfc_parser import HDFCParser
-from app.parsers.icici_parser import ICICIParser
-from app.parsers.sbi_parser import SBIParser
-from app.parsers.axis_parser import AxisParser
-from app.parsers.amex_parser import AmexParser
-from app.schemas import ParserResponse
+from app import metrics
+from app.config import Config
+from app.llm_extractor import LLMBudget, get_response_cache, llm_stats
+from app.metrics import StageTimer
+from app.parser_registry import get_parser_registry
+from app.pipeline import ParsePipeline, PipelineError
+from app.result_cache import ResultCache
+from app.schemas import ParserResponse, StatementData
 
 # Configure logging
 structlog.configure(
@@ -25,12 +35,156 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# CPU-bound stages run in a process pool, the LLM call as async I/O
+pipeline = ParsePipeline()
+
+# Re-uploads of the same PDF are served from here
+result_cache = ResultCache(Config.RESULT_CACHE_PATH or None) if Config.RESULT_CACHE_ENABLED else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pipeline.start()
+    if Config.WARMUP_ON_START:
+        await pipeline.warmup()
+    yield
+    pipeline.shutdown()
+    if result_cache is not None:
+        result_cache.close()
+
+async def _run_cached(content: bytes, timer: StageTimer,
+                      llm_budget: Optional[LLMBudget] = None) -> Tuple[StatementData, bool]:
+    """Run the pipeline unless this exact PDF was parsed by this parser version"""
+    if result_cache is not None:
+        with timer.span("cache_lookup"):
+            statement_data = await asyncio.to_thread(result_cache.get, content)
+        if statement_data is not None:
+            return statement_data, True
+    
+    statement_data = await pipeline.run(content, timer, llm_budget or LLMBudget())
+    
+    if result_cache is not None:
+        await asyncio.to_thread(result_cache.put, content, statement_data)
+    return statement_data, False
+
+def _collect_runtime_stats():
+    """Scrape-time gauges for state owned by other components"""
+    for name, value in pipeline.stats().items():
+        yield f"parse_pipeline_{name}", "gauge", f"Parse pipeline {name.replace('_', ' ')}", value
+    for name, value in llm_stats.snapshot().items():
+        if name == "in_flight":
+            yield "llm_in_flight", "gauge", "LLM calls in flight", value
+        else:
+            yield f"llm_{name}_total", "counter", f"LLM {name.replace('_', ' ')}", value
+    caches = [("result_cache", result_cache), ("llm_cache", get_response_cache(create=False))]
+    for prefix, cache in caches:
+        if cache is None:
+            continue
+        stats = cache.stats()
+        label = prefix.replace("_", " ")
+        yield f"{prefix}_hits_total", "counter", f"{label} hits", stats["hits"]
+        yield f"{prefix}_misses_total", "counter", f"{label} misses", stats["misses"]
+
+metrics.registry.add_collector(_collect_runtime_stats)
+
+class UploadRejected(Exception):
+    """Upload refused before any parsing (not a PDF, or too large)"""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _size_limit_message() -> str:
+    return f"File size exceeds {Config.MAX_UPLOAD_SIZE / (1024 * 1024):.3g}MB limit"
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """
+    Read an upload in chunks into memory, enforcing MAX_UPLOAD_SIZE and
+    rejecting anything without a %PDF header as soon as the first chunk
+    arrives. Nothing is written to disk; Starlette's own spooled copy of
+    the request body is closed here as well.
+    """
+    try:
+        chunks = []
+        size = 0
+        while True:
+            chunk = await file.read(max(Config.UPLOAD_CHUNK_SIZE, 1024))
+            if not chunk:
+                break
+            if size == 0 and b"%PDF" not in chunk[:1024]:
+                raise UploadRejected(400, "Only PDF files are supported")
+            size += len(chunk)
+            if size > Config.MAX_UPLOAD_SIZE:
+                raise UploadRejected(413, _size_limit_message())
+            chunks.append(chunk)
+    finally:
+        await file.close()
+    
+    if not chunks:
+        raise UploadRejected(400, "Only PDF files are supported")
+    return b"".join(chunks)
+
 app = FastAPI(
     title="Credit Card Statement Parser",
     description="AI-powered PDF statement parser with LLM fallback supporting 5 major issuers",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
+# Room for the multipart boundaries and part headers around each file
+_FORM_OVERHEAD = 64 * 1024
+
+def _upload_limit(path: str) -> Optional[int]:
+    """Largest Content-Length an upload route accepts (None: not an upload route)"""
+    if path == "/parse-statement":
+        return Config.MAX_UPLOAD_SIZE + _FORM_OVERHEAD
+    if path == "/parse-statements":
+        return Config.MAX_BATCH_FILES * (Config.MAX_UPLOAD_SIZE + _FORM_OVERHEAD)
+    return None
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    413 an upload whose declared Content-Length can't fit under
+    MAX_UPLOAD_SIZE (per file, MAX_BATCH_FILES of them for a batch), before
+    the multipart body is received and spooled. Bodies without the header
+    are still capped file by file in _read_upload.
+    """
+    limit = _upload_limit(request.url.path) if request.method == "POST" else None
+    if limit is not None:
+        try:
+            declared = int(request.headers.get("content-length", ""))
+        except ValueError:
+            declared = 0
+        if declared > limit:
+            logger.warning("upload_rejected", path=request.url.path, declared_size=declared,
+                           error="content-length too large")
+            response = ParserResponse(
+                success=False,
+                errors=[_size_limit_message()],
+                processing_time_ms=0.0
+            )
+            return JSONResponse(status_code=413, content=response.model_dump())
+    return await call_next(request)
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """In-flight gauge and latency histogram for every route"""
+    start_time = time.perf_counter()
+    metrics.in_flight_requests.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.in_flight_requests.dec()
+        # Label with the route template, not the raw path, so arbitrary URLs
+        # (404 probes, path parameters) can't create new series
+        route = request.scope.get("route")
+        metrics.request_seconds.observe(time.perf_counter() - start_time,
+                                        path=route.path if route else "unmatched",
+                                        status=status)
+
 # Configure CORS to allow frontend communication
 app.add_middleware(
     CORSMiddleware,
@@ -40,79 +194,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Parser registry - All 5 issuers supported
-PARSER_REGISTRY = {
-    "HDFC": HDFCParser(),
-    "ICICI": ICICIParser(),
-    "SBI": SBIParser(),
-    "AXIS": AxisParser(),
-    "AMEX": AmexParser(),
-}
-
 @app.post("/parse-statement", response_model=ParserResponse)
-async def parse_statement(file: UploadFile = File(...)):
+async def parse_statement(file: UploadFile = File(...), timings: bool = False):
     """
     Parse credit card statement PDF
     
     - Supports multiple issuers
     - Multi-strategy extraction (regex, tables, LLM)
     - Returns confidence scores
+    - ``?timings=true`` adds a per-stage breakdown (ms)
     """
     start_time = time.time()
+    timer = StageTimer()
     
     try:
-        # Validate file type
-        if not file.filename.endswith('.pdf'):
-            raise HTTPException(400, "Only PDF files are supported")
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        logger.info("file_uploaded", filename=file.filename, size=len(content))
-        
-        # Extract content
-        pdf_loader = PDFLoader()
-        text = pdf_loader.extract_text(tmp_path)
-        tables = pdf_loader.extract_tables(tmp_path)
-        
-        # Detect issuer
-        issuer, issuer_confidence = IssuerDetector.detect(text)
-        
-        if not issuer:
-            return ParserResponse(
+        # Validate size and file type while reading; the PDF stays in memory
+        try:
+            content = await _read_upload(file)
+        except UploadRejected as e:
+            logger.warning("upload_rejected", filename=file.filename, error=str(e))
+            response = ParserResponse(
                 success=False,
-                errors=["Could not detect card issuer"],
+                errors=[str(e)],
                 processing_time_ms=(time.time() - start_time) * 1000
             )
+            return JSONResponse(status_code=e.status_code, content=response.model_dump())
         
-        # Get appropriate parser
-        parser = PARSER_REGISTRY.get(issuer)
+        logger.info("file_uploaded", filename=file.filename, size=len(content))
         
-        if not parser:
+        # Extract, detect and parse off the event loop
+        try:
+            statement_data, cached = await _run_cached(content, timer)
+        except PipelineError as e:
             return ParserResponse(
                 success=False,
-                errors=[f"Parser not implemented for {issuer}"],
-                processing_time_ms=(time.time() - start_time) * 1000
+                errors=[str(e)],
+                processing_time_ms=(time.time() - start_time) * 1000,
+                timings=timer.timings if timings else None
             )
-        
-        # Parse statement
-        statement_data = parser.parse(text, tables)
+        issuer = statement_data.issuer.value
         
         processing_time = (time.time() - start_time) * 1000
         
         logger.info("parsing_completed", 
                    issuer=issuer,
                    confidence=statement_data.overall_confidence,
+                   cached=cached,
                    time_ms=processing_time)
         
         return ParserResponse(
             success=True,
             data=statement_data,
             errors=statement_data.parsing_errors,
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            cached=cached,
+            timings=timer.timings if timings else None
         )
         
     except Exception as e:
@@ -123,133 +259,129 @@ async def parse_statement(file: UploadFile = File(...)):
             processing_time_ms=(time.time() - start_time) * 1000
         )
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "version": "2.0.0"}
+async def _parse_bytes(filename: str, content: Union[bytes, UploadRejected],
+                       timings: bool = False,
+                       llm_budget: Optional[LLMBudget] = None) -> ParserResponse:
+    """Parse one file of a batch; failures become an error response"""
+    start_time = time.time()
+    timer = StageTimer()
+    
+    try:
+        if isinstance(content, UploadRejected):
+            raise content
+        
+        statement_data, cached = await _run_cached(content, timer, llm_budget)
+        return ParserResponse(
+            success=True,
+            data=statement_data,
+            errors=statement_data.parsing_errors,
+            processing_time_ms=(time.time() - start_time) * 1000,
+            filename=filename,
+            cached=cached,
+            timings=timer.timings if timings else None
+        )
+    except Exception as e:
+        logger.warning("batch_file_failed", filename=filename, error=str(e))
+        return ParserResponse(
+            success=False,
+            errors=[str(e)],
+            processing_time_ms=(time.time() - start_time) * 1000,
+            filename=filename
+        )
 
-@app.get("/supported-issuers")
-async def get_supported_issuers():
-    """List supported card issuers"""
-    return {
-        "issuers": list(PARSER_REGISTRY.keys()),
-        "count": len(PARSER_REGISTRY)
+# The batch form is parsed by the handler itself (see parse_statements);
+# this keeps it documented like a File(...) parameter
+_BATCH_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["files"],
+            "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+        }}},
     }
+}
 
-# ----------------------------------------------------------------------------
-# File: test_example.py
-# ----------------------------------------------------------------------------
-"""
-Example usage and testing
-"""
-
-if __name__ == "__main__":
-    # CLI Usage Example
-    import sys
-    from app.pdf_loader import PDFLoader
-    from app.issuer_detector import IssuerDetector
-    from app.parsers.hdfc_parser import HDFCParser
-    from app.parsers.icici_parser import ICICIParser
-    from app.parsers.sbi_parser import SBIParser
-    from app.parsers.axis_parser import AxisParser
-    from app.parsers.amex_parser import AmexParser
-    
-    # Parser registry for CLI
-    PARSER_REGISTRY = {
-        "HDFC": HDFCParser(),
-        "ICICI": ICICIParser(),
-        "SBI": SBIParser(),
-        "AXIS": AxisParser(),
-        "AMEX": AmexParser(),
-    }
+@app.post("/parse-statements", openapi_extra=_BATCH_FORM_SCHEMA)
+async def parse_statements(request: Request, timings: bool = False):
+    """
+    Parse many statement PDFs in one request
     
-    if len(sys.argv) < 2:
-        print("Usage: python test_example.py <pdf_path>")
-        print("\nSupported Issuers:")
-        print("  • HDFC Bank")
-        print("  • ICICI Bank")
-        print("  • SBI Card")
-        print("  • Axis Bank")
-        print("  • American Express")
-        sys.exit(1)
+    - Files are fanned out over the worker pool
+    - Streams one ParserResponse JSON line (NDJSON) per file as it completes
+    - A failing file yields an error line and never stops the batch
+    """
+    # FastAPI closes File(...) uploads as soon as the handler returns, which
+    # would force reading every file into memory up front. Parsing the form
+    # here keeps the files in Starlette's spooled temp files until each one's
+    # turn comes; the stream closes them when it ends.
+    form = await request.form(max_files=Config.MAX_BATCH_FILES)
+    files = [value for value in form.getlist("files") if isinstance(value, FormFile)]
+    if not files:
+        await form.close()
+        return JSONResponse(status_code=422, content={"detail": "Upload one or more PDFs as 'files'"})
+    logger.info("batch_uploaded", files=len(files))
     
-    pdf_path = sys.argv[1]
+    # LLM_REQUEST_BUDGET caps fallback calls across the whole batch
+    llm_budget = LLMBudget()
+    # Files in memory at once: enough to keep every worker busy while
+    # others wait on their LLM call
+    parsing = asyncio.Semaphore(max(pipeline.workers, 1) + Config.LLM_MAX_CONCURRENCY)
     
-    print(f"\n{'='*60}")
-    print(f"CREDIT CARD STATEMENT PARSER v2.0")
-    print(f"{'='*60}\n")
+    async def parse_file(file: FormFile) -> ParserResponse:
+        async with parsing:
+            try:
+                content = await _read_upload(file)
+            except UploadRejected as e:
+                # Reported on this file's own line
+                content = e
+            return await _parse_bytes(file.filename, content, timings, llm_budget)
     
-    # Load PDF
-    print("📄 Loading PDF...")
-    loader = PDFLoader()
-    text = loader.extract_text(pdf_path)
-    tables = loader.extract_tables(pdf_path)
-    print(f"   ✓ Extracted {len(text)} characters")
-    print(f"   ✓ Found {len(tables)} tables\n")
+    tasks = [asyncio.create_task(parse_file(file)) for file in files]
     
-    # Detect issuer
-    print("🔍 Detecting issuer...")
-    issuer, confidence = IssuerDetector.detect(text)
-    print(f"   ✓ Detected: {issuer} (confidence: {confidence:.2f})\n")
+    async def stream_results():
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                response = await next_done
+                yield response.model_dump_json() + "\n"
+        finally:
+            # Client went away: don't keep parsing for nobody
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await form.close()
     
-    # Parse
-    parser = PARSER_REGISTRY.get(issuer)
-    if parser:
-        print("⚙️  Parsing statement...")
-        result = parser.parse(text, tables)
-        
-        print(f"\n{'='*60}")
-        print(f"PARSING RESULTS")
-        print(f"{'='*60}")
-        print(f"Overall Confidence: {result.overall_confidence:.2f}")
-        print(f"Fallback Used: {'Yes (LLM)' if result.fallback_used else 'No (Regex)'}")
-        print(f"\n{'-'*60}")
-        
-        # Format output with colors/emojis
-        fields = [
-            ("🏦 Issuer", result.issuer),
-            ("💳 Card Last 4", result.card_last_4),
-            ("📅 Statement Period", result.statement_period),
-            ("⏰ Due Date", result.due_date),
-            ("💰 Total Due", result.total_amount_due)
-        ]
-        
-        for label, field in fields:
-            method_emoji = {
-                "regex": "🔧",
-                "table": "📊", 
-                "layout": "📐",
-                "llm": "🤖"
-            }.get(field.extraction_method, "❓")
-            
-            conf_color = "🟢" if field.confidence >= 0.9 else "🟡" if field.confidence >= 0.7 else "🔴"
-            
-            value_display = field.value if field.value else "NOT FOUND"
-            if label == "💰 Total Due" and field.value:
-                value_display = f"₹{field.value}"
-            
-            print(f"\n{label}")
-            print(f"  Value: {value_display}")
-            print(f"  Method: {method_emoji} {field.extraction_method.upper()}")
-            print(f"  Confidence: {conf_color} {field.confidence:.2f}")
-        
-        if result.parsing_errors:
-            print(f"\n{'-'*60}")
-            print("⚠️  WARNINGS:")
-            for error in result.parsing_errors:
-                print(f"  • {error}")
-        
-        print(f"\n{'='*60}")
-        
-        # Summary
-        if result.overall_confidence >= 0.9:
-            print("✅ HIGH CONFIDENCE - All fields extracted reliably")
-        elif result.overall_confidence >= 0.7:
-            print("⚠️  MEDIUM CONFIDENCE - Some fields may need verification")
-        else:
-            print("❌ LOW CONFIDENCE - Manual review recommended")
-        
-        print(f"{'='*60}\n")
-    else:
-        print(f"❌ No parser available for {issuer}")
-        print(f"   Supported issuers: {', '.join(PARSER_REGISTRY.keys())}")
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return {"status": "healthy", "version": "2.0.0"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters"""
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+@app.get("/llm/stats")
+async def llm_call_stats():
+    """LLM call, retry, timeout and queue-wait counters"""
+    return llm_stats.snapshot()
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics: stage/request histograms, fallback and queue gauges"""
+    return PlainTextResponse(metrics.registry.render(),
+                             media_type="text/plain; version=0.0.4")
+
+@app.get("/supported-issuers")
+async def get_supported_issuers():
+    """List supported card issuers (registry metadata; no parser code is imported)"""
+    registry = get_parser_registry()
+    return {
+        "issuers": registry.codes(),
+        "count": len(registry),
+        "parsers": [info.to_dict() for info in registry.infos()]
+    }
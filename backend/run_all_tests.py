@@ -9,11 +9,7 @@ import sys
 
 try:
     from app.issuer_detector import IssuerDetector
-    from app.parsers.hdfc_parser import HDFCParser
-    from app.parsers.icici_parser import ICICIParser
-    from app.parsers.sbi_parser import SBIParser
-    from app.parsers.axis_parser import AxisParser
-    from app.parsers.amex_parser import AmexParser
+    from app.parser_registry import get_parser_registry
     from tests.mock_statements import MockStatementGenerator
 except Exception as e:
     print("Error importing project modules:", e)
@@ -27,13 +23,15 @@ def run_visual_tests():
     print("CREDIT CARD PARSER - COMPREHENSIVE TEST SUITE")
     print("=" * 70 + "\n")
 
-    issuers = [
-        ("HDFC Bank", HDFCParser(), MockStatementGenerator.generate_hdfc_statement()),
-        ("ICICI Bank", ICICIParser(), MockStatementGenerator.generate_icici_statement()),
-        ("SBI Card", SBIParser(), MockStatementGenerator.generate_sbi_statement()),
-        ("Axis Bank", AxisParser(), MockStatementGenerator.generate_axis_statement()),
-        ("American Express", AmexParser(), MockStatementGenerator.generate_amex_statement()),
-    ]
+    # Every registered issuer that has a mock statement
+    registry = get_parser_registry()
+    issuers = []
+    for info in registry.infos():
+        generator = getattr(MockStatementGenerator, f"generate_{info.code.lower()}_statement", None)
+        if generator is None:
+            print(f"Skipping {info.name}: no mock statement")
+            continue
+        issuers.append((info.name, registry.get(info.code), generator()))
 
     results = []
 
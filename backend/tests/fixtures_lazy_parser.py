@@ -0,0 +1,7 @@
+"""Parser module for tests/test_parser_registry.py (imported lazily by the registry)"""
+
+from app.parsers.base_parser import BaseParser
+
+
+class LazyParser(BaseParser):
+    ISSUER = "LAZY"
@@ -0,0 +1,233 @@
+"""
+Synthetic PDF corpus generator.
+
+Renders ``MockStatementGenerator`` output into real PDFs with PyMuPDF so the
+PDF path (pdfplumber text and table extraction) can be exercised at scale:
+long transaction listings, many pages, ruled tables and junk lines between
+rows. Output is fully determined by the seed.
+
+    from tests.pdf_corpus import render_statement, generate_corpus
+    pdf_bytes, expected = render_statement("HDFC", pages=50, rows=3000, seed=7)
+
+    python -m tests.pdf_corpus corpus/ --count 1000 --pages 1-50 --rows 0-3000
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+from tests.mock_statements import MockStatementGenerator
+
+ISSUERS = ["HDFC", "ICICI", "SBI", "AXIS", "AMEX"]
+
+# A4 in points; one text line is LINE_HEIGHT tall at FONT_SIZE
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 40
+FONT_SIZE = 7
+LINE_HEIGHT = 9
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+# Ruled tables: header + TABLE_ROWS rows, COLUMN_WIDTHS wide
+TABLE_ROWS = 5
+TABLE_ROW_HEIGHT = 14
+COLUMN_WIDTHS = (80, 300, 100)
+TABLE_HEADER = ("Date", "Description", "Amount")
+# Text lines a table displaces at the bottom of its page (incl. spacing)
+TABLE_LINES = ((TABLE_ROWS + 1) * TABLE_ROW_HEIGHT + 2 * LINE_HEIGHT) // LINE_HEIGHT + 1
+
+MERCHANTS = [
+    "Amazon", "Flipkart", "Swiggy", "Zomato", "Uber", "Ola", "BigBasket",
+    "Myntra", "BookMyShow", "Reliance Digital", "IRCTC", "MakeMyTrip",
+    "Croma", "Starbucks", "Indian Oil", "Apollo Pharmacy",
+]
+
+NOISE_LINES = [
+    "Page {page} of statement - continued",
+    "Earn 5X reward points on dining this festive season*",
+    "*T&C apply. Visit our website for details.",
+    "{junk}",
+    "Ref No. {digits}",
+    "-- -- -- -- -- -- -- -- -- -- -- -- -- --",
+]
+
+
+def _generate_text(issuer: str, rng: random.Random) -> Tuple[str, Dict[str, str]]:
+    """Mock statement with randomized card number and amount"""
+    digits = "".join(rng.choice(string.digits) for _ in range(5))
+    amount = f"{rng.randint(100, 99999)}.{rng.randint(0, 99):02d}"
+
+    if issuer == "AMEX":
+        text = MockStatementGenerator.generate_amex_statement(card_last_5=digits, amount=amount)
+    else:
+        generator = getattr(MockStatementGenerator, f"generate_{issuer.lower()}_statement")
+        text = generator(card_last_4=digits[-4:], amount=amount)
+
+    return text, {"issuer": issuer, "card_last_4": digits[-4:], "total_amount_due": amount}
+
+
+def _transaction(rng: random.Random) -> Tuple[str, str, str]:
+    day = rng.randint(1, 28)
+    merchant = rng.choice(MERCHANTS)
+    amount = f"Rs. {rng.randint(10, 50000):,}.{rng.randint(0, 99):02d}"
+    return f"{day:02d}-Nov-24", merchant, amount
+
+
+def _noise_line(rng: random.Random, page: int) -> str:
+    junk = "".join(rng.choice(string.ascii_letters + string.digits + " .,-/")
+                   for _ in range(rng.randint(20, 70)))
+    digits = "".join(rng.choice(string.digits) for _ in range(12))
+    return rng.choice(NOISE_LINES).format(page=page, junk=junk, digits=digits)
+
+
+def _draw_table(page: fitz.Page, top: float, rows: Sequence[Tuple[str, str, str]]):
+    """Ruled grid (every cell outlined) so pdfplumber finds it as a table"""
+    for row_index, cells in enumerate([TABLE_HEADER, *rows]):
+        y0 = top + row_index * TABLE_ROW_HEIGHT
+        x0 = MARGIN
+        for width, cell in zip(COLUMN_WIDTHS, cells):
+            page.draw_rect(fitz.Rect(x0, y0, x0 + width, y0 + TABLE_ROW_HEIGHT), width=0.5)
+            page.insert_text((x0 + 3, y0 + TABLE_ROW_HEIGHT - 4), cell, fontsize=FONT_SIZE)
+            x0 += width
+
+
+def render_statement(issuer: str = "HDFC", pages: int = 1, rows: int = 0,
+                     tables: int = 0, noise: float = 0.0,
+                     seed: int = 0) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Render one statement PDF.
+
+    The mock statement fills page 1; ``rows`` transaction lines flow over
+    the following pages (page 1 too when ``pages`` is 1) and ``tables``
+    ruled tables sit at the bottom of the transaction pages. ``noise`` is
+    the chance of a junk line after each transaction row. The document gets
+    more than ``pages`` pages when the content doesn't fit.
+
+    Returns the PDF bytes and the field values a parser should extract.
+    """
+    if issuer not in ISSUERS:
+        raise ValueError(f"Unknown issuer {issuer}; expected one of {ISSUERS}")
+    rng = random.Random(f"{seed}:{issuer}")
+    statement, expected = _generate_text(issuer, rng)
+
+    # The base-14 fonts have no rupee glyph; statements spell it out anyway
+    statement = statement.replace("₹", "Rs. ")
+    page_lines: List[List[str]] = [[line.strip() for line in statement.strip().splitlines()]]
+    first_listing_page = 1 if pages > 1 else 0
+    while len(page_lines) < max(pages, 1):
+        page_lines.append([])
+
+    # Tables are dealt out round-robin over the transaction pages
+    table_pages = list(range(first_listing_page, len(page_lines)))
+    page_tables: Dict[int, List[List[Tuple[str, str, str]]]] = {}
+    for i in range(tables):
+        table_rows = [_transaction(rng) for _ in range(TABLE_ROWS)]
+        page_tables.setdefault(table_pages[i % len(table_pages)], []).append(table_rows)
+
+    def capacity(index: int) -> int:
+        return LINES_PER_PAGE - TABLE_LINES * len(page_tables.get(index, []))
+
+    current = first_listing_page
+    for _ in range(rows):
+        date, merchant, amount = _transaction(rng)
+        lines = [f"{date}   {merchant:<24} {amount}"]
+        if noise and rng.random() < noise:
+            lines.append(_noise_line(rng, current + 1))
+        for line in lines:
+            while len(page_lines[current]) >= capacity(current):
+                current += 1
+                if current == len(page_lines):
+                    page_lines.append([])
+            page_lines[current].append(line)
+
+    doc = fitz.open()
+    for index, lines in enumerate(page_lines):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if lines:
+            page.insert_text((MARGIN, MARGIN), "\n".join(lines), fontsize=FONT_SIZE,
+                             lineheight=LINE_HEIGHT / FONT_SIZE)
+        bottom = PAGE_HEIGHT - MARGIN
+        for table_rows in page_tables.get(index, []):
+            top = bottom - (TABLE_ROWS + 1) * TABLE_ROW_HEIGHT
+            _draw_table(page, top, table_rows)
+            bottom = top - 2 * LINE_HEIGHT
+    # No random /ID, so the same seed gives byte-identical files
+    data = doc.tobytes(garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+    return data, expected
+
+
+def _pick(rng: random.Random, value) -> int:
+    """An int, or a (low, high) range to draw from"""
+    if isinstance(value, (tuple, list)):
+        return rng.randint(value[0], value[1])
+    return value
+
+
+def generate_corpus(directory: str, count: int, issuers: Optional[Sequence[str]] = None,
+                    pages=1, rows=0, tables=0, noise: float = 0.0,
+                    seed: int = 0) -> List[Dict]:
+    """
+    Write ``count`` statements to ``directory`` plus a ``manifest.json``
+    describing each file (parameters and expected field values).
+    ``pages``, ``rows`` and ``tables`` take an int or a (low, high) range.
+    """
+    rng = random.Random(seed)
+    issuers = list(issuers or ISSUERS)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = []
+    for i in range(count):
+        params = {
+            "issuer": issuers[i % len(issuers)],
+            "pages": _pick(rng, pages),
+            "rows": _pick(rng, rows),
+            "tables": _pick(rng, tables),
+            "noise": noise,
+            "seed": rng.randrange(2 ** 32),
+        }
+        data, expected = render_statement(**params)
+        filename = f"{i:05d}_{params['issuer'].lower()}.pdf"
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(data)
+        manifest.append({"file": filename, "size": len(data), **params, "expected": expected})
+
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def int_or_range(value: str):
+    """Command-line "N" or "LOW-HIGH", as ``generate_corpus`` takes it"""
+    low, _, high = value.partition("-")
+    return (int(low), int(high)) if high else int(low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic statement PDF corpus")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--issuer", action="append", choices=ISSUERS,
+                        help="issuer to include (repeatable; default: all, round-robin)")
+    parser.add_argument("--pages", type=int_or_range, default=1, help="N or LOW-HIGH")
+    parser.add_argument("--rows", type=int_or_range, default=0, help="N or LOW-HIGH")
+    parser.add_argument("--tables", type=int_or_range, default=0, help="N or LOW-HIGH")
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="chance of a junk line after each transaction row")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(args.directory, args.count, issuers=args.issuer,
+                               pages=args.pages, rows=args.rows, tables=args.tables,
+                               noise=args.noise, seed=args.seed)
+    total = sum(entry["size"] for entry in manifest)
+    print(f"Wrote {len(manifest)} PDFs ({total / 1e6:.1f} MB) to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
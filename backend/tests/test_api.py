@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app import metrics
+from app.config import Config
+from tests.pdf_corpus import render_statement
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Every upload is parsed afresh, in-process
+    monkeypatch.setattr(main, "result_cache", None)
+    monkeypatch.setattr(main, "pipeline", main.ParsePipeline(processes=0))
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_request_metrics_are_labelled_by_route(client):
+    client.get("/nonexistent/abc")
+    client.get("/nonexistent/def")
+    client.get("/health")
+
+    paths = {key[0] for key in metrics.request_seconds._values}
+    assert "unmatched" in paths
+    assert "/health" in paths
+    assert not any(path.startswith("/nonexistent") for path in paths)
+
+
+def test_non_pdf_upload_is_rejected(client):
+    response = client.post("/parse-statement",
+                           files={"file": ("notes.txt", b"just some text", "text/plain")})
+
+    assert response.status_code == 400
+    assert response.json()["errors"] == ["Only PDF files are supported"]
+
+
+def test_empty_upload_is_rejected(client):
+    response = client.post("/parse-statement",
+                           files={"file": ("empty.pdf", b"", "application/pdf")})
+
+    assert response.status_code == 400
+    assert not response.json()["success"]
+
+
+def test_oversized_upload_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_UPLOAD_SIZE", 1024)
+
+    response = client.post("/parse-statement",
+                           files={"file": ("big.pdf", b"%PDF-1.4\n" + b"0" * 2048, "application/pdf")})
+
+    assert response.status_code == 413
+    assert "exceeds" in response.json()["errors"][0]
+
+
+def test_oversized_upload_is_rejected_on_its_content_length(client, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_UPLOAD_SIZE", 1024)
+
+    # Not a PDF either: a 413 rather than a 400 means the body was never read
+    response = client.post("/parse-statement",
+                           files={"file": ("big.txt", b"0" * (200 * 1024), "text/plain")})
+
+    assert response.status_code == 413
+
+
+def test_batch_streams_one_line_per_file(client):
+    uploads, expected = [], {}
+    for seed, issuer in enumerate(["HDFC", "SBI", "AXIS"]):
+        pdf, fields = render_statement(issuer, seed=seed)
+        uploads.append(("files", (f"{issuer}.pdf", pdf, "application/pdf")))
+        expected[f"{issuer}.pdf"] = fields["card_last_4"]
+    uploads.append(("files", ("notes.txt", b"not a statement", "text/plain")))
+
+    response = client.post("/parse-statements", files=uploads)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    by_name = {line["filename"]: line for line in lines}
+    assert len(lines) == 4
+    assert set(by_name) == {*expected, "notes.txt"}
+    for name, card in expected.items():
+        assert by_name[name]["success"]
+        assert by_name[name]["data"]["card_last_4"]["value"] == card
+    assert not by_name["notes.txt"]["success"]
+    assert by_name["notes.txt"]["errors"] == ["Only PDF files are supported"]
+
+
+def test_batch_is_rejected_on_its_content_length(client, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_UPLOAD_SIZE", 1024)
+    monkeypatch.setattr(Config, "MAX_BATCH_FILES", 2)
+    # Fits a single file's limit, but three files are over the batch's
+    uploads = [("files", (f"{i}.pdf", b"%PDF" + b"0" * (60 * 1024), "application/pdf"))
+               for i in range(3)]
+
+    response = client.post("/parse-statements", files=uploads)
+
+    assert response.status_code == 413
+
+
+def test_batch_file_count_is_capped(client, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_BATCH_FILES", 2)
+    uploads = [("files", (f"{i}.pdf", b"%PDF", "application/pdf")) for i in range(3)]
+
+    response = client.post("/parse-statements", files=uploads)
+
+    assert response.status_code == 400
+
+
+def test_batch_reads_files_only_as_they_are_parsed(client, monkeypatch):
+    monkeypatch.setattr(main.ParsePipeline, "workers", property(lambda self: 1))
+    monkeypatch.setattr(Config, "LLM_MAX_CONCURRENCY", 1)
+    in_memory, peak = [0], [0]
+    read_upload = main._read_upload
+
+    async def counting_read(file):
+        content = await read_upload(file)
+        in_memory[0] += 1
+        peak[0] = max(peak[0], in_memory[0])
+        return content
+
+    async def slow_parse(filename, content, timings=False, llm_budget=None):
+        await asyncio.sleep(0.01)
+        in_memory[0] -= 1
+        return main.ParserResponse(success=True, processing_time_ms=0.0, filename=filename)
+
+    monkeypatch.setattr(main, "_read_upload", counting_read)
+    monkeypatch.setattr(main, "_parse_bytes", slow_parse)
+    uploads = [("files", (f"{i}.pdf", b"%PDF-1.4", "application/pdf")) for i in range(8)]
+
+    response = client.post("/parse-statements", files=uploads)
+
+    assert len(response.text.splitlines()) == 8
+    assert peak[0] == 2
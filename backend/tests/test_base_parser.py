@@ -0,0 +1,150 @@
+import pytest
+
+from app import metrics
+from app.config import Config
+from app.llm_extractor import LLMBudget
+from app.memory import MemoryLimitExceeded
+from app.parsers.base_parser import BaseParser
+from app.parsers.hdfc_parser import HDFCParser
+from tests.mock_statements import MockStatementGenerator
+
+
+class FakeTableProvider:
+    def __init__(self, tables):
+        self._tables = tables
+        self.requested_pages = []
+
+    def get(self, pages=None):
+        self.requested_pages.append(pages)
+        return self._tables
+
+
+class TableOnlyParser(BaseParser):
+    TABLE_PAGES = (0,)
+
+    def extract_with_regex(self, text: str) -> dict:
+        return {"issuer": {"value": "HDFC Bank", "method": "regex"}}
+
+    def extract_with_tables(self, tables: list) -> dict:
+        return {"card_last_4": {"value": tables[0][0][0], "method": "table"}}
+
+
+class HDFCTableParser(HDFCParser):
+    def extract_with_tables(self, tables: list) -> dict:
+        return {"card_last_4": {"value": tables[0][0][0], "method": "table"}}
+
+
+def test_tables_not_materialized_when_regex_finds_everything():
+    provider = FakeTableProvider([[["9999"]]])
+    result = HDFCTableParser().parse(MockStatementGenerator.generate_hdfc_statement(), provider)
+
+    assert result.card_last_4.value == "4567"
+    assert provider.requested_pages == []
+
+
+def test_tables_materialized_for_parser_pages_when_fields_missing():
+    provider = FakeTableProvider([[["9999"]]])
+    result = TableOnlyParser().parse("no useful text", provider)
+
+    assert provider.requested_pages == [(0,)]
+    assert result.card_last_4.value == "9999"
+    assert result.card_last_4.extraction_method == "table"
+
+
+def test_memory_limit_during_table_extraction_is_not_swallowed():
+    class OverLimitTables:
+        def get(self, pages=None):
+            raise MemoryLimitExceeded("statement grew worker RSS past the ceiling")
+
+    with pytest.raises(MemoryLimitExceeded):
+        TableOnlyParser().extract("no useful text", OverLimitTables())
+
+
+def test_parsers_share_one_llm_service():
+    from app.parsers.sbi_parser import SBIParser
+
+    assert HDFCParser().llm_extractor is SBIParser().llm_extractor
+
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.requested = []
+
+    def extract_fields(self, text, issuer=None, fields=None):
+        self.requested.append(fields)
+        return {field: self.answer.get(field) for field in fields}
+
+
+def _hdfc_with_llm(monkeypatch, answer):
+    llm = FakeLLM(answer)
+    monkeypatch.setattr(Config, "USE_LLM_FALLBACK", True)
+    monkeypatch.setattr(HDFCParser, "llm_extractor", property(lambda self: llm))
+    return HDFCParser(), llm
+
+
+def test_llm_gets_only_fields_below_threshold(monkeypatch):
+    parser, llm = _hdfc_with_llm(monkeypatch, {"due_date": "15/12/2024"})
+    text = MockStatementGenerator.generate_hdfc_statement().replace("15-Dec-2024", "in 15 days")
+
+    result = parser.parse(text)
+
+    # Present but fails validation: re-extracted by the LLM
+    assert llm.requested == [["due_date"]]
+    assert result.due_date.value == "15/12/2024"
+    assert result.due_date.extraction_method == "llm"
+
+
+def _avoided(reason):
+    return metrics.llm_calls_avoided_total._values.get(("HDFC", reason), 0)
+
+
+def test_complete_statement_counts_no_avoided_call(monkeypatch):
+    parser, llm = _hdfc_with_llm(monkeypatch, {})
+    before = _avoided("threshold")
+
+    parser.parse(MockStatementGenerator.generate_hdfc_statement())
+
+    assert llm.requested == []
+    assert _avoided("threshold") == before
+
+
+def test_zero_threshold_skips_the_llm_for_missing_fields(monkeypatch):
+    parser, llm = _hdfc_with_llm(monkeypatch, {})
+    monkeypatch.setattr(Config, "CONFIDENCE_THRESHOLD_BY_ISSUER", {"HDFC": 0.0})
+    before = _avoided("threshold")
+
+    parser.parse("HDFC Bank statement with nothing else")
+
+    assert llm.requested == []
+    assert _avoided("threshold") == before + 1
+
+
+def test_llm_budget_is_shared_across_statements(monkeypatch):
+    parser, llm = _hdfc_with_llm(monkeypatch, {})
+    budget = LLMBudget(1)
+
+    for _ in range(3):
+        parser.apply_llm_fallback("HDFC Bank", {}, [], budget)
+
+    assert len(llm.requested) == 1
+
+
+def test_fields_skipped_for_budget_are_reported_and_not_cached(monkeypatch):
+    from app.result_cache import ResultCache
+
+    parser, llm = _hdfc_with_llm(monkeypatch, {})
+    before = _avoided("budget")
+    result, errors = parser.extract("HDFC Bank statement with nothing else")
+    budget = LLMBudget(1)
+    budget.try_spend()
+
+    assert parser.apply_llm_fallback("", result, errors, budget) is False
+    statement = parser._build_statement_data(result, errors, False)
+    cache = ResultCache(None, version="test")
+    cache.put(b"%PDF", statement)
+
+    assert llm.requested == []
+    assert any("budget exhausted" in error for error in statement.parsing_errors)
+    assert _avoided("budget") == before + 1
+    assert cache.get(b"%PDF") is None
@@ -0,0 +1,22 @@
+from benchmarks.harness import compare, measure, percentile
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+
+
+def test_measure_reports_runs_and_ordered_stats():
+    stats = measure(lambda: sum(range(100)), warmup=1, repeat=10)
+
+    assert stats["runs"] == 10
+    assert stats["min_ms"] <= stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 1.0}, "c": {"p50_ms": 1.0}}
+    current = {"a": {"p50_ms": 1.5}, "b": {"p50_ms": 1.1}, "d": {"p50_ms": 1.0}}
+
+    status = {row["name"]: row["status"] for row in compare(baseline, current, threshold=0.2)}
+
+    assert status == {"a": "regression", "b": "ok", "c": "missing", "d": "new"}
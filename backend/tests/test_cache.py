@@ -0,0 +1,60 @@
+from app.cache import PersistentLRUCache
+from app.config import Config
+from app.result_cache import ResultCache, parser_version
+from tests.mock_statements import MockStatementGenerator
+from app.parsers.hdfc_parser import HDFCParser
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PersistentLRUCache(None, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_survive_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentLRUCache(path)
+    cache.set("key", "value")
+    cache.close()
+
+    reopened = PersistentLRUCache(path)
+    assert reopened.get("key") == "value"
+    reopened.close()
+
+
+def test_result_cache_is_keyed_by_parser_version(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    statement = HDFCParser().parse(MockStatementGenerator.generate_hdfc_statement())
+    content = b"%PDF-1.7 same bytes"
+
+    ResultCache(path, version="v1").put(content, statement)
+
+    assert ResultCache(path, version="v1").get(content) == statement
+    assert ResultCache(path, version="v2").get(content) is None
+
+
+def test_streaming_settings_change_the_parser_version(monkeypatch):
+    before = parser_version()
+    monkeypatch.setattr(Config, "STREAM_PAGE_BUDGET", 3)
+
+    assert parser_version() != before
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: clock[0])
+    cache = PersistentLRUCache(str(tmp_path / "ttl.sqlite3"), ttl=60)
+    cache.set("key", "value")
+
+    clock[0] += 59
+    assert cache.get("key") == "value"
+    clock[0] += 2
+    assert cache.get("key") is None
+    cache.close()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from app import llm_extractor
+from app.config import Config
+from app.llm_extractor import FIELD_DESCRIPTIONS, LLMExtractor, llm_stats
+from benchmarks.fake_groq import FakeGroq, LatencyModel, answer, create_app
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Run a FakeGroq on a free port and point the extractor's config at it"""
+    monkeypatch.setattr(llm_extractor, "_response_cache", None)
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE", 0.001)
+    servers = []
+
+    def start(fake: FakeGroq) -> FakeGroq:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(create_app(fake), port=port, log_level="error"))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.01)
+        servers.append(server)
+        monkeypatch.setattr(Config, "GROQ_BASE_URL", f"http://127.0.0.1:{port}")
+        return fake
+
+    yield start
+    for server in servers:
+        server.should_exit = True
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+
+    assert LatencyModel("fixed:250").sample(rng) == 0.25
+    assert 0.1 <= LatencyModel("uniform:100-400").sample(rng) <= 0.4
+    with pytest.raises(ValueError):
+        LatencyModel("poisson:3")
+
+
+def test_answers_every_requested_field():
+    extractor = LLMExtractor(api_key=None)
+    prompt = extractor._build_prompt("HDFC Bank statement", issuer="HDFC Bank",
+                                     fields=["issuer", "due_date"])
+
+    data = answer(prompt)
+
+    assert set(data) == {"issuer", "due_date"}
+    assert data["issuer"] == "HDFC Bank"
+    assert answer(prompt) == data
+
+
+def test_extractor_talks_to_the_stand_in(fake_server):
+    fake = fake_server(FakeGroq(seed=1))
+    extractor = LLMExtractor(api_key="fake")
+
+    data = asyncio.run(extractor.extract_fields_async("Card ending 1234", issuer="SBI Card"))
+
+    assert set(data) == set(FIELD_DESCRIPTIONS)
+    assert fake.stats()["outcomes"]["ok"] == 1
+
+
+def test_malformed_answers_are_retried_then_given_up(fake_server, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_RETRIES", 2)
+    fake = fake_server(FakeGroq(malformed_rate=1.0, seed=1))
+    extractor = LLMExtractor(api_key="fake")
+    before = llm_stats.snapshot()
+
+    with pytest.raises(json.JSONDecodeError):
+        asyncio.run(extractor.extract_fields_async("Card ending 1234"))
+
+    assert fake.calls == 3
+    assert llm_stats.snapshot()["retries"] - before["retries"] == 2
@@ -22,3 +22,25 @@ def test_detect_returns_issuer_and_confidence(generator_func, expected_code):
     assert isinstance(confidence, float)
     assert 0.0 <= confidence <= 1.0
     assert issuer == expected_code
+
+
+def test_detect_scans_past_header_when_issuer_is_not_in_it():
+    filler = "\n".join(f"01-Nov-24 Purchase {i}  Rs. 100.00" for i in range(500))
+    text = filler + "\nAxis Bank Credit Card\nAxis Credit Card Statement"
+
+    assert IssuerDetector.detect(text) == ("AXIS", 1.0)
+
+
+def test_detect_counts_every_mention_when_header_is_ambiguous():
+    filler = "\n".join(f"01-Nov-24 Purchase {i}  Rs. 100.00" for i in range(500))
+    text = "HDFC Bank\nAmex\n" + filler + "\nHDFC Credit Card\nHDFC Bank"
+
+    issuer, confidence = IssuerDetector.detect(text)
+
+    assert issuer == "HDFC"
+    assert confidence == 1.0
+
+
+def test_overlapping_patterns_each_count():
+    # "state bank ... card" and "sbi card" overlap; both are SBI evidence
+    assert IssuerDetector.detect("State Bank of India SBI Card statement") == ("SBI", 1.0)
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm_extractor
+from app.config import Config
+from app.llm_batcher import LLMBatcher
+from app.llm_extractor import LLMExtractor
+
+
+class DocumentCompletions:
+    """
+    Async fake answering single and multi-document prompts from the text:
+    each document's card number is the "ending NNNN" in its excerpt.
+    ``drop`` lists batch document ids left out of the answer.
+    """
+
+    def __init__(self, latency=0.0, drop=(), batch_content=None, batch_error=None):
+        self.latency = latency
+        self.drop = set(drop)
+        self.batch_content = batch_content
+        self.batch_error = batch_error
+        self.prompts = []
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.latency)
+        sections = re.findall(r"=== (doc\d+)[^\n]*\n(.*?)(?====|\Z)", prompt, re.S)
+        content = None
+        if sections:
+            if self.batch_error is not None:
+                raise self.batch_error
+            content = self.batch_content
+            payload = {doc_id: self._fields(text) for doc_id, text in sections
+                       if doc_id not in self.drop}
+        else:
+            payload = self._fields(prompt)
+        message = SimpleNamespace(content=content or json.dumps(payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    @staticmethod
+    def _fields(text):
+        return {"card_last_4": re.search(r"ending (\d{4})", text).group(1)}
+
+
+@pytest.fixture
+def make_batcher(monkeypatch):
+    monkeypatch.setattr(llm_extractor, "_response_cache", None)
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(Config, "MAX_RETRIES", 0)
+
+    def make(completions, **kwargs):
+        extractor = LLMExtractor(api_key=None)
+        extractor.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return LLMBatcher(extractor, **kwargs)
+    return make
+
+
+async def _extract_many(batcher, count):
+    return await asyncio.gather(*(
+        batcher.extract_fields_async(f"Card ending {1000 + i}", fields=["card_last_4"])
+        for i in range(count)
+    ))
+
+
+def test_concurrent_requests_share_one_call(make_batcher):
+    completions = DocumentCompletions(latency=0.05)
+    batcher = make_batcher(completions, window_ms=20, max_docs=8)
+
+    results = asyncio.run(_extract_many(batcher, 16))
+
+    assert results == [{"card_last_4": str(1000 + i)} for i in range(16)]
+    assert len(completions.prompts) == 2
+
+
+def test_documents_missing_from_the_answer_fall_back_to_single_calls(make_batcher):
+    completions = DocumentCompletions(drop={"doc1"})
+    batcher = make_batcher(completions, window_ms=20, max_docs=8)
+
+    results = asyncio.run(_extract_many(batcher, 3))
+
+    assert results == [{"card_last_4": "1000"}, {"card_last_4": "1001"}, {"card_last_4": "1002"}]
+    assert len(completions.prompts) == 2
+    assert "=== doc" not in completions.prompts[-1]
+
+
+def test_malformed_batch_falls_back_for_every_document(make_batcher):
+    completions = DocumentCompletions(batch_content='{"doc0": {"card_last_4": ')
+    batcher = make_batcher(completions, window_ms=20, max_docs=8)
+
+    results = asyncio.run(_extract_many(batcher, 4))
+
+    assert [r["card_last_4"] for r in results] == ["1000", "1001", "1002", "1003"]
+    assert len(completions.prompts) == 5
+
+
+def test_failed_batch_call_resubmits_each_document(make_batcher, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_RETRIES", 1)
+    completions = DocumentCompletions(batch_error=asyncio.TimeoutError())
+    batcher = make_batcher(completions, window_ms=20, max_docs=8)
+
+    results = asyncio.run(_extract_many(batcher, 4))
+
+    assert results == [{"card_last_4": str(1000 + i)} for i in range(4)]
+    # The batch call and its retry, then one call per document
+    assert len(completions.prompts) == 2 + 4
+
+
+def test_batched_answers_are_cached_as_single_document_answers(make_batcher, monkeypatch):
+    from app.cache import PersistentLRUCache
+
+    monkeypatch.setattr(llm_extractor, "_response_cache", PersistentLRUCache(None))
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", True)
+    completions = DocumentCompletions()
+    batcher = make_batcher(completions, window_ms=20, max_docs=8)
+
+    asyncio.run(_extract_many(batcher, 3))
+    again = asyncio.run(batcher.extractor.extract_fields_async(
+        "Card ending 1001", fields=["card_last_4"]))
+
+    assert again == {"card_last_4": "1001"}
+    assert len(completions.prompts) == 1
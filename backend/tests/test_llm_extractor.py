@@ -0,0 +1,123 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm_extractor
+from app.cache import PersistentLRUCache
+from app.config import Config
+from app.llm_extractor import LLMExtractor, build_context, llm_stats
+
+
+class FakeCompletions:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return self.response()
+
+    def response(self):
+        message = SimpleNamespace(content=json.dumps(self.payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class SlowThenOkCompletions(FakeCompletions):
+    """Async fake that hangs on the first ``hangs`` calls"""
+
+    def __init__(self, payload, hangs):
+        super().__init__(payload)
+        self.hangs = hangs
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.hangs:
+            await asyncio.sleep(10)
+        return self.response()
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(llm_extractor, "_response_cache", PersistentLRUCache(None))
+    extractor = LLMExtractor(api_key=None)
+    completions = FakeCompletions({"card_last_4": "4567", "due_date": "15-Dec-2024"})
+    extractor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return extractor, completions
+
+
+def test_repeated_prompt_is_served_from_cache(extractor):
+    extractor, completions = extractor
+
+    first = extractor.extract_fields("HDFC statement text")
+    second = extractor.extract_fields("HDFC statement text")
+
+    assert first == second == {"card_last_4": "4567", "due_date": "15-Dec-2024"}
+    assert completions.calls == 1
+
+
+def test_cache_can_be_bypassed(extractor):
+    extractor, completions = extractor
+
+    extractor.extract_fields("HDFC statement text")
+    extractor.extract_fields("HDFC statement text", use_cache=False)
+
+    assert completions.calls == 2
+
+
+def test_async_call_times_out_and_retries(monkeypatch):
+    monkeypatch.setattr(llm_extractor, "_response_cache", None)
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_TIMEOUT", 0.05)
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(Config, "MAX_RETRIES", 3)
+    extractor = LLMExtractor(api_key=None)
+    completions = SlowThenOkCompletions({"due_date": "15-Dec-2024"}, hangs=2)
+    extractor.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    before = llm_stats.snapshot()
+
+    data = asyncio.run(extractor.extract_fields_async("statement text"))
+
+    after = llm_stats.snapshot()
+    assert data == {"due_date": "15-Dec-2024"}
+    assert completions.calls == 3
+    assert after["timeouts"] - before["timeouts"] == 2
+    assert after["retries"] - before["retries"] == 2
+
+
+def test_async_call_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(llm_extractor, "_response_cache", None)
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_TIMEOUT", 0.01)
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(Config, "MAX_RETRIES", 1)
+    extractor = LLMExtractor(api_key=None)
+    completions = SlowThenOkCompletions({}, hangs=5)
+    extractor.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(extractor.extract_fields_async("statement text"))
+    assert completions.calls == 2
+
+
+def test_context_keeps_labelled_lines_beyond_the_old_cutoff():
+    filler = "\n".join(f"01/11/24  Merchant {i}  Rs. {i}.00" for i in range(400))
+    text = "SBI CARD\nCredit Card Statement\n" + filler + "\nPayment Due Date: 18/12/2024\n"
+
+    context = build_context(text, ["due_date"])
+
+    assert len(text) > 6000
+    assert "SBI CARD" in context
+    assert "Payment Due Date: 18/12/2024" in context
+    assert "Merchant 200" not in context
+    assert len(context) < 1000
+
+
+def test_prompt_only_asks_for_missing_fields(extractor):
+    extractor, completions = extractor
+
+    prompt = extractor._build_prompt("HDFC statement", fields=["due_date"])
+
+    assert '"due_date"' in prompt
+    assert '"card_last_4"' not in prompt
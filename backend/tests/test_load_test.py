@@ -0,0 +1,49 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI, File, UploadFile
+
+from benchmarks.load_test import ResourceSampler, parse_mix, run_level, summarize
+
+
+def test_issuer_mix_weights():
+    assert parse_mix("HDFC=3,AMEX") == ["HDFC", "HDFC", "HDFC", "AMEX"]
+    with pytest.raises(ValueError):
+        parse_mix("KOTAK=1")
+
+
+def test_run_level_records_latency_and_errors():
+    app = FastAPI()
+
+    @app.post("/parse-statement")
+    async def parse_statement(file: UploadFile = File(...)):
+        return {"success": not file.filename.startswith("bad")}
+
+    corpus = [({"file": "good.pdf", "issuer": "HDFC"}, b"%PDF"),
+              ({"file": "bad.pdf", "issuer": "AMEX"}, b"%PDF")]
+
+    async def drive():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await run_level(client, corpus, concurrency=4, requests=40)
+
+    records, elapsed = asyncio.run(drive())
+    stats = summarize(records, elapsed)
+
+    assert stats["requests"] == 40
+    assert stats["errors"] == stats["by_issuer"]["AMEX"]["requests"] > 0
+    assert stats["by_issuer"]["HDFC"]["error_rate"] == 0.0
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert stats["statuses"] == {"200": 40}
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="reads /proc")
+def test_resource_sampler_sees_this_process():
+    with ResourceSampler(os.getpid(), interval=0.02) as sampler:
+        sum(i * i for i in range(300_000))
+
+    assert sampler.samples
+    assert sampler.summary()["rss_mb_max"] > 0
+    assert sampler.samples[-1]["processes"][0]["pid"] == os.getpid()
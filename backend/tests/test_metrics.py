@@ -0,0 +1,51 @@
+import asyncio
+
+from app.metrics import Counter, Histogram, StageTimer
+from app.pipeline import ParsePipeline
+from tests.pdf_corpus import render_statement
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("stage_seconds", "help", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="regex")
+    histogram.observe(0.5, stage="regex")
+    histogram.observe(5.0, stage="regex")
+
+    lines = histogram.render()
+
+    assert 'stage_seconds_bucket{stage="regex",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="regex",le="1.0"} 2' in lines
+    assert 'stage_seconds_bucket{stage="regex",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="regex"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("files_total", "help", ("name",))
+    counter.inc(name='a "quoted"\nname')
+
+    assert 'files_total{name="a \\"quoted\\"\\nname"} 1' in counter.render()
+
+
+def test_stage_timer_accumulates_repeated_spans():
+    timer = StageTimer()
+    for _ in range(3):
+        with timer.span("text_extraction"):
+            pass
+    timer.merge({"text_extraction": 1.0, "llm": 2.0})
+
+    assert timer.timings["text_extraction"] >= 1.0
+    assert timer.timings["llm"] == 2.0
+
+
+def test_pipeline_reports_stage_timings():
+    pdf, _ = render_statement("SBI", seed=2)
+    pipeline = ParsePipeline(processes=0)
+    timer = StageTimer()
+    try:
+        asyncio.run(pipeline.run(pdf, timer))
+    finally:
+        pipeline.shutdown()
+
+    assert {"queue_wait", "pdf_open", "text_extraction", "issuer_detection",
+            "regex", "validation"} <= set(timer.timings)
+    assert pipeline.stats()["pending"] == 0
@@ -0,0 +1,73 @@
+import sys
+
+import pytest
+
+from app.config import Config
+from app.parser_registry import BUILTIN_PARSERS, ParserInfo, ParserRegistry
+
+
+def test_config_plugins_extend_and_override_builtins(monkeypatch):
+    monkeypatch.setattr(Config, "PARSER_PLUGINS", {
+        "KOTAK": "kotak_parser:KotakParser",
+        "SBI": "app.parsers.sbi_parser:SBIParser",
+    })
+
+    registry = ParserRegistry()
+
+    assert registry.codes()[:5] == [info.code for info in BUILTIN_PARSERS]
+    assert "KOTAK" in registry
+    sources = {info.code: info.source for info in registry.infos()}
+    assert sources["KOTAK"] == sources["SBI"] == "config"
+    assert sources["HDFC"] == "builtin"
+
+
+def test_parser_module_is_imported_on_first_get():
+    module = "tests.fixtures_lazy_parser"
+    registry = ParserRegistry([ParserInfo("LAZY", f"{module}:LazyParser")])
+    sys.modules.pop(module, None)
+
+    assert registry.loaded() == []
+    parser = registry.get("LAZY")
+
+    assert module in sys.modules
+    assert registry.get("LAZY") is parser
+    assert registry.loaded() == ["LAZY"]
+    assert registry.get("UNKNOWN") is None
+
+
+PLUGIN_SPEC = """
+issuer: CODE
+display_name: Acme Card
+detect:
+  - 'acme\\s+card'
+  - 'acme\\s+rewards'
+fields:
+  card_last_4:
+    patterns:
+      - 'ending\\s+(\\d{4})'
+"""
+
+
+# "ACME-1" is no valid regex group name, which detection must not depend on
+@pytest.mark.parametrize("code", ["ACME", "ACME-1"])
+def test_plugin_parser_is_detected_from_its_own_pattern_spec(tmp_path, monkeypatch, code):
+    from app import parser_registry, pattern_registry
+    from app.issuer_detector import IssuerDetector
+    from app.pipeline import get_parser
+
+    (tmp_path / "acme_parser.py").write_text(
+        "from app.parsers.base_parser import BaseParser\n\n"
+        f"class AcmeParser(BaseParser):\n    ISSUER = '{code}'\n")
+    (tmp_path / "acme_parser.yaml").write_text(PLUGIN_SPEC.replace("CODE", code))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "acme_parser", raising=False)
+    monkeypatch.setattr(Config, "PARSER_PLUGINS", {code: "acme_parser:AcmeParser"})
+    monkeypatch.setattr(parser_registry, "_registry", None)
+    monkeypatch.setattr(pattern_registry, "_registry", None)
+
+    issuer, confidence = IssuerDetector.detect("Acme Card statement\nAcme Rewards card ending 4321")
+
+    assert (issuer, confidence) == (code, 1.0)
+    result = get_parser(code).extract_with_regex("Acme Card ending 4321")
+    assert result["issuer"]["value"] == "Acme Card"
+    assert result["card_last_4"]["value"] == "4321"
@@ -0,0 +1,40 @@
+import pytest
+
+from app.parsers.amex_parser import AmexParser
+from app.parsers.icici_parser import ICICIParser
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Card No: ****7890", "7890"),
+    ("Card No. XXXX7890", "7890"),
+])
+def test_icici_card_number_with_or_without_the_dot(text, expected):
+    assert ICICIParser().extract_with_regex(text)["card_last_4"]["value"] == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Statement from: 01/11/2024 To: 30/11/2024",
+    "Statement From 01/11/2024 to 30/11/2024",
+])
+def test_icici_statement_period_with_or_without_colons(text):
+    result = ICICIParser().extract_with_regex(text)
+
+    assert result["statement_period"]["value"] == "01/11/2024 to 30/11/2024"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Card Member No: *****34567", "4567"),
+    ("Card Member No. XXXXX34567", "4567"),
+])
+def test_amex_card_member_number_with_or_without_the_dot(text, expected):
+    assert AmexParser().extract_with_regex(text)["card_last_4"]["value"] == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Billing Period: Nov 01, 2024 - Nov 30, 2024",
+    "Statement Period: Nov 01, 2024 - Nov 30, 2024",
+])
+def test_amex_month_first_periods(text):
+    result = AmexParser().extract_with_regex(text)
+
+    assert result["statement_period"]["value"] == "Nov 01, 2024 to Nov 30, 2024"
@@ -0,0 +1,52 @@
+import os
+
+from app.pattern_registry import PatternRegistry
+
+SPEC = """
+issuer: TEST
+display_name: Test Bank
+fields:
+  card_last_4:
+    patterns:
+      - '{pattern}'
+  total_amount_due:
+    transform: amount
+    patterns:
+      - 'Total Due[:\\s]*([\\d,]+\\.?\\d*)'
+"""
+
+
+def _write_spec(path, pattern, mtime):
+    path.write_text(SPEC.format(pattern=pattern))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_patterns_are_compiled_and_applied(tmp_path):
+    _write_spec(tmp_path / "test.yaml", r"Card ending (\d{4})", 1)
+    spec = PatternRegistry(str(tmp_path), reload_interval=0).get("TEST")
+
+    assert spec.display_name == "Test Bank"
+    assert spec.fields["card_last_4"].extract("Card ending 4321") == "4321"
+    assert spec.fields["total_amount_due"].extract("Total Due: 1,234.50") == "1234.50"
+
+
+def test_changed_file_is_reloaded_without_restart(tmp_path):
+    path = tmp_path / "test.yaml"
+    _write_spec(path, r"Card ending (\d{4})", 1)
+    registry = PatternRegistry(str(tmp_path), reload_interval=0.000001)
+    old_fingerprint = registry.fingerprint()
+
+    _write_spec(path, r"Card no\. (\d{4})", 2)
+
+    assert registry.get("TEST").fields["card_last_4"].extract("Card no. 9876") == "9876"
+    assert registry.fingerprint() != old_fingerprint
+
+
+def test_broken_file_keeps_previous_spec(tmp_path):
+    path = tmp_path / "test.yaml"
+    _write_spec(path, r"Card ending (\d{4})", 1)
+    registry = PatternRegistry(str(tmp_path), reload_interval=0.000001)
+
+    _write_spec(path, r"Card ending (\d{4}", 2)
+
+    assert registry.get("TEST").fields["card_last_4"].extract("Card ending 4321") == "4321"
@@ -0,0 +1,38 @@
+import json
+
+from app.pdf_loader import PDFLoader
+from app.pipeline import extract_statement
+from tests.pdf_corpus import generate_corpus, render_statement
+
+
+def test_render_is_deterministic_per_seed():
+    first, expected = render_statement("SBI", pages=2, rows=50, tables=1, noise=0.2, seed=3)
+    second, _ = render_statement("SBI", pages=2, rows=50, tables=1, noise=0.2, seed=3)
+    other, _ = render_statement("SBI", pages=2, rows=50, tables=1, noise=0.2, seed=4)
+
+    assert first == second
+    assert first != other
+    assert expected["issuer"] == "SBI"
+
+
+def test_rendered_pdf_has_pages_tables_and_parseable_fields():
+    pdf, expected = render_statement("HDFC", pages=3, rows=150, tables=2, seed=1)
+
+    with PDFLoader.load(pdf) as document:
+        assert document.page_count >= 3
+        tables = document.tables
+    assert len(tables) == 2
+    assert tables[0][0] == ["Date", "Description", "Amount"]
+
+    extracted = extract_statement(pdf)
+    assert extracted["issuer"] == "HDFC"
+    assert extracted["result"]["card_last_4"]["value"] == expected["card_last_4"]
+    assert extracted["result"]["total_amount_due"]["value"] == expected["total_amount_due"]
+
+
+def test_generate_corpus_writes_files_and_manifest(tmp_path):
+    manifest = generate_corpus(str(tmp_path), count=3, pages=(1, 2), rows=(0, 20), seed=9)
+
+    assert [entry["issuer"] for entry in manifest] == ["HDFC", "ICICI", "SBI"]
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert all((tmp_path / entry["file"]).stat().st_size == entry["size"] for entry in manifest)
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from app import memory
+from app.config import Config
+from app.pdf_loader import PDFPLUMBER, PYMUPDF, PDFLoader
+from app.pipeline import PipelineError, _read_pages, extract_statement
+from benchmarks.engines import parse_fields
+from tests.pdf_corpus import ISSUERS, render_statement
+
+
+# Period and due date as printed in each issuer's mock statement
+MOCK_DATES = {
+    "HDFC": ("01-Nov-2024 to 30-Nov-2024", "15-Dec-2024"),
+    "ICICI": ("01/11/2024 to 30/11/2024", "20/12/2024"),
+    "SBI": ("01/11/2024 to 30/11/2024", "18/12/2024"),
+    "AXIS": ("01 Nov 2024 to 30 Nov 2024", "22 Dec 2024"),
+    "AMEX": ("Nov 01, 2024 to Nov 30, 2024", "Dec 25, 2024"),
+}
+
+
+@pytest.mark.parametrize("issuer", ISSUERS)
+def test_text_engines_parse_the_same_fields(issuer):
+    pdf, expected = render_statement(issuer, pages=2, rows=80, tables=1, noise=0.2, seed=11)
+
+    fast, _ = parse_fields(pdf, PYMUPDF)
+    reference, _ = parse_fields(pdf, PDFPLUMBER)
+
+    assert fast == reference
+    assert fast["detected_issuer"] == issuer
+    assert fast["card_last_4"] == expected["card_last_4"]
+    assert fast["total_amount_due"] == expected["total_amount_due"]
+    assert (fast["statement_period"], fast["due_date"]) == MOCK_DATES[issuer]
+
+
+def test_issuer_override_switches_engine_after_detection(monkeypatch):
+    monkeypatch.setattr(Config, "PDF_TEXT_ENGINE_BY_ISSUER", {"SBI": PDFPLUMBER})
+    pdf, expected = render_statement("SBI", seed=2)
+
+    with PDFLoader.load(pdf, text_engine=PYMUPDF) as document:
+        text, issuer, _, _ = _read_pages(document)
+        engine = document.text_engine
+
+    assert issuer == "SBI"
+    assert engine == PDFPLUMBER
+    assert expected["card_last_4"] in text
+
+
+def test_unknown_engine_is_rejected():
+    pdf, _ = render_statement("HDFC")
+
+    with pytest.raises(ValueError, match="Unknown text engine"):
+        PDFLoader.load(pdf, text_engine="tesseract")
+
+
+def test_low_memory_mode_keeps_no_page_objects():
+    pdf, _ = render_statement("HDFC", pages=3, rows=200, tables=2, seed=4)
+
+    with PDFLoader.load(pdf, text_engine=PDFPLUMBER, low_memory=True) as document:
+        text = document.text
+        tables = document.table_provider().get()
+        cached = [page for page in document.plumber.pages if hasattr(page, "_objects")]
+        page_texts = [page._text for page in document.pages]
+
+    assert "HDFC" in text and len(tables) == 2
+    assert cached == []
+    assert page_texts == [None] * len(page_texts)
+
+
+def test_memory_ceiling_fails_the_statement(monkeypatch):
+    growth = iter(range(0, 10**12, 50 * 1024 * 1024))
+    monkeypatch.setattr(memory, "rss_bytes", lambda: next(growth))
+    monkeypatch.setattr(Config, "MAX_REQUEST_MEMORY_MB", 120)
+    monkeypatch.setattr(Config, "STREAMING_EXTRACTION", False)
+    pdf, _ = render_statement("SBI", pages=5, rows=300, seed=5)
+
+    with pytest.raises(PipelineError, match="exceeds the 120MB memory limit \\(page 3 text\\)"):
+        extract_statement(pdf)
+
+
+def test_memory_ceiling_is_off_under_the_thread_executor(monkeypatch):
+    from app.pipeline import ParsePipeline
+
+    growth = iter(range(0, 10**12, 50 * 1024 * 1024))
+    monkeypatch.setattr(memory, "rss_bytes", lambda: next(growth))
+    monkeypatch.setattr(Config, "MAX_REQUEST_MEMORY_MB", 120)
+    monkeypatch.setattr(Config, "STREAMING_EXTRACTION", False)
+    pdf, expected = render_statement("SBI", pages=5, rows=300, seed=5)
+    pipeline = ParsePipeline(processes=0)
+
+    # Threads share one RSS, so other parses' memory would count here
+    try:
+        statement = asyncio.run(pipeline.run(pdf))
+    finally:
+        pipeline.shutdown()
+
+    assert pipeline.memory_limit_mb == 0
+    assert statement.card_last_4.value == expected["card_last_4"]
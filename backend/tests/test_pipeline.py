@@ -0,0 +1,154 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+import pytest
+
+from app.config import Config
+from app.pdf_loader import PDFLoader
+from app.pipeline import ParsePipeline, PipelineError, _read_pages, extract_statement
+from tests.mock_statements import MockStatementGenerator
+from tests.pdf_corpus import render_statement
+
+
+def _write_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 50), text, fontsize=8)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = ParsePipeline(processes=0)
+    yield pipeline
+    pipeline.shutdown()
+
+
+def test_pipeline_parses_pdf(pipeline, tmp_path):
+    pdf_path = _write_pdf(tmp_path / "sbi.pdf", MockStatementGenerator.generate_sbi_statement())
+
+    statement = asyncio.run(pipeline.run(pdf_path))
+
+    assert statement.issuer.value == "SBI Card"
+    assert statement.card_last_4.value == "1234"
+
+
+def test_pipeline_reports_unknown_issuer(pipeline, tmp_path):
+    pdf_path = _write_pdf(tmp_path / "unknown.pdf", "Some unrelated document")
+
+    with pytest.raises(PipelineError, match="Could not detect card issuer"):
+        asyncio.run(pipeline.run(pdf_path))
+
+
+def test_pipeline_parses_in_a_worker_process():
+    pdf, expected = render_statement("AXIS", seed=3)
+    pipeline = ParsePipeline(processes=1)
+
+    async def parse_twice():
+        # Both jobs go through the one spawned worker
+        return await asyncio.gather(pipeline.run(pdf), pipeline.run(pdf))
+
+    try:
+        statements = asyncio.run(parse_twice())
+        assert isinstance(pipeline._cpu_executor, ProcessPoolExecutor)
+        assert pipeline.workers == 1
+    finally:
+        pipeline.shutdown()
+
+    assert [s.card_last_4.value for s in statements] == [expected["card_last_4"]] * 2
+    assert statements[0].issuer.value == "Axis Bank"
+
+
+def _write_pages(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((50, 50), text, fontsize=8)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_streaming_stops_reading_once_all_fields_are_found(tmp_path):
+    filler = "\n".join(f"01-Nov-24 Filler row {i}  Rs. 100.00" for i in range(40))
+    pdf_path = _write_pages(tmp_path / "long.pdf", [
+        MockStatementGenerator.generate_sbi_statement(), filler, filler,
+    ])
+
+    with PDFLoader.load(pdf_path) as document:
+        text, issuer, _, _ = _read_pages(document)
+        unread = [page.page_num for page in document.pages if page._text is None]
+
+    assert issuer == "SBI"
+    assert "Filler row" not in text
+    assert unread == [1, 2]
+
+
+def test_streaming_keeps_reading_past_a_low_confidence_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CONFIDENCE_THRESHOLD_BY_ISSUER", {"SBI": 0.99})
+    filler = "\n".join(f"01-Nov-24 Filler row {i}  Rs. 100.00" for i in range(40))
+    pdf_path = _write_pages(tmp_path / "weak.pdf", [
+        MockStatementGenerator.generate_sbi_statement(), filler,
+    ])
+
+    with PDFLoader.load(pdf_path) as document:
+        text, issuer, _, _ = _read_pages(document)
+
+    # Every field is found on page 1, but none scores 0.99
+    assert issuer == "SBI"
+    assert "Filler row" in text
+
+
+def test_streaming_scores_each_page_for_the_issuer_once(tmp_path, monkeypatch):
+    from app.issuer_detector import IssuerDetector
+
+    scored = []
+    score = IssuerDetector.score
+    monkeypatch.setattr(IssuerDetector, "score",
+                        lambda text: scored.append(text) or score(text))
+    covers = [f"Cover page {i}" for i in range(4)]
+    pdf_path = _write_pages(tmp_path / "covers.pdf",
+                            covers + [MockStatementGenerator.generate_sbi_statement()])
+
+    with PDFLoader.load(pdf_path) as document:
+        _, issuer, _, _ = _read_pages(document)
+
+    assert issuer == "SBI"
+    assert [text.strip() for text in scored[:4]] == covers
+    assert len(scored) == 5
+
+
+def test_streamed_regex_pass_is_reused_and_matches_a_full_read(monkeypatch):
+    from app.parsers.sbi_parser import SBIParser
+
+    pdf, _ = render_statement("SBI", pages=3, rows=120, seed=6)
+    full_passes = []
+    extract_with_regex = SBIParser.extract_with_regex
+
+    def spy(self, text, fields=None):
+        if fields is None:
+            full_passes.append(len(text))
+        return extract_with_regex(self, text, fields)
+
+    monkeypatch.setattr(SBIParser, "extract_with_regex", spy)
+    streamed = extract_statement(pdf)
+    monkeypatch.setattr(Config, "STREAMING_EXTRACTION", False)
+    full = extract_statement(pdf)
+
+    # One pass when the issuer turned up while streaming, one for the full read
+    assert len(full_passes) == 2
+    assert streamed["result"] == full["result"]
+
+
+def test_streaming_page_budget_caps_pages_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "STREAM_PAGE_BUDGET", 1)
+    pdf_path = _write_pages(tmp_path / "late.pdf", [
+        "Statement cover page", MockStatementGenerator.generate_sbi_statement(),
+    ])
+
+    with PDFLoader.load(pdf_path) as document:
+        _, issuer, _, _ = _read_pages(document)
+
+    assert issuer is None
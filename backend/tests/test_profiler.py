@@ -0,0 +1,57 @@
+import os
+import time
+
+from app import profiler
+from app.profiler import CPROFILE, SAMPLE, RequestProfiler
+
+
+def test_choose_mode_profiles_one_in_n(monkeypatch):
+    monkeypatch.setattr(profiler, "_request_counter", iter(range(1, 7)))
+
+    modes = [profiler.choose_mode(sample_rate=3, slow_ms=0) for _ in range(6)]
+
+    assert modes == [None, None, CPROFILE, None, None, CPROFILE]
+
+
+def test_cprofile_mode_writes_pstats_named_after_request(tmp_path):
+    request_profiler = RequestProfiler(CPROFILE, directory=str(tmp_path))
+    with request_profiler:
+        sum(range(1000))
+
+    path = request_profiler.finish("HDFC", 3, {"pdf_open": 1.2, "regex": 0.4})
+
+    name = os.path.basename(path)
+    assert name.endswith("_HDFC_3p_total2_pdf_open1_regex0.pstats")
+    assert os.path.getsize(path) > 0
+
+
+def test_sample_mode_keeps_only_slow_requests(tmp_path):
+    fast = RequestProfiler(SAMPLE, directory=str(tmp_path), slow_ms=10_000, interval_ms=1)
+    with fast:
+        pass
+    slow = RequestProfiler(SAMPLE, directory=str(tmp_path), slow_ms=20, interval_ms=1)
+    with slow:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    assert fast.finish("SBI", 1, {}) is None
+    path = slow.finish("SBI", 1, {})
+    assert path.endswith(".folded")
+    with open(path) as f:
+        assert "test_sample_mode_keeps_only_slow_requests" in f.read()
+
+
+def test_unwritable_profile_dir_does_not_fail_the_request(tmp_path, monkeypatch):
+    from app.config import Config
+    from app.pipeline import extract_statement
+    from tests.pdf_corpus import render_statement
+
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setattr(Config, "PROFILE_DIR", str(blocker / "profiles"))
+    pdf, expected = render_statement("SBI", seed=1)
+
+    extracted = extract_statement(pdf, profile_mode=CPROFILE)
+
+    assert extracted["result"]["card_last_4"]["value"] == expected["card_last_4"]
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+from app import pipeline
+from app.parser_registry import get_parser_registry
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Slow imports (~0.5s together) that must wait for first use. Checked by
+# presence rather than by a wall-clock budget, which flakes on loaded CI
+# machines
+HEAVY_MODULES = ["fitz", "pdfplumber", "pydantic", "groq", "yaml", "fastapi"]
+
+
+def _run(code: str):
+    """Run ``code`` in a fresh interpreter; it prints a JSON object"""
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _import_report(module: str) -> dict:
+    return _run(f"""
+import json, sys
+import {module}
+print(json.dumps({{"loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+                  "parsers": sorted(m for m in sys.modules if m.startswith("app.parsers."))}}))
+""")
+
+
+def test_pipeline_import_leaves_heavy_modules_unloaded():
+    report = _import_report("app.pipeline")
+
+    assert report["loaded"] == []
+    assert report["parsers"] == ["app.parsers.base_parser"]
+
+
+def test_cli_does_not_import_the_web_stack():
+    assert _import_report("app.cli")["loaded"] == []
+
+
+def test_parsers_are_imported_on_first_use():
+    report = _run("""
+import json, sys
+from app.pipeline import get_parser
+get_parser("SBI")
+print(json.dumps(sorted(m for m in sys.modules if m.startswith("app.parsers."))))
+""")
+
+    assert report == ["app.parsers.base_parser", "app.parsers.sbi_parser"]
+
+
+def test_warmup_builds_every_parser():
+    pipeline.warmup()
+
+    registry = get_parser_registry()
+    assert set(registry.loaded()) == set(registry.codes())
+
+
+def test_supported_issuers_are_listed_without_importing_parsers():
+    report = _run("""
+import asyncio, json, sys
+import main
+issuers = asyncio.run(main.get_supported_issuers())
+print(json.dumps({"count": issuers["count"],
+                  "parsers": sorted(m for m in sys.modules if m.startswith("app.parsers."))}))
+""")
+
+    assert report == {"count": 5, "parsers": ["app.parsers.base_parser"]}